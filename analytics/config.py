@@ -0,0 +1,18 @@
+import os
+
+# Worker processes used for analytics jobs (defaults to the number of CPUs)
+ANALYTICS_WORKERS = int(os.environ.get("SUZE_ANALYTICS_WORKERS", 0)) or None
+# Analytics jobs allowed to run at the same time
+ANALYTICS_CONCURRENCY = int(os.environ.get("SUZE_ANALYTICS_CONCURRENCY", 2))
+# Jobs allowed to wait for a free slot before new requests are rejected
+ANALYTICS_MAX_PENDING = int(os.environ.get("SUZE_ANALYTICS_MAX_PENDING", 8))
+# Seconds a request waits for its job before giving up, 0 disables the timeout
+ANALYTICS_TIMEOUT = float(os.environ.get("SUZE_ANALYTICS_TIMEOUT", 300)) or None
+# Player histories processed per chunk when computing features
+FEATURES_CHUNK_SIZE = int(os.environ.get("SUZE_FEATURES_CHUNK_SIZE", 10000))
+# How percentile features are ranked: "exact" or "sketch" (approximate, constant memory)
+PERCENTILE_MODE = os.environ.get("SUZE_PERCENTILE_MODE", "exact")
+# Target rank error of the percentile sketches, as a fraction of the population
+PERCENTILE_ERROR = float(os.environ.get("SUZE_PERCENTILE_ERROR", 0.01))
+# Memory for cached responses of the read endpoints, in megabytes
+READ_CACHE_MB = float(os.environ.get("SUZE_READ_CACHE_MB", 64))
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from .odds_classic import PERCENTILE_FEATURES, _calculate_metrics
+from .utils import SQLITE_MAX_VARIABLES
+
+# Bump when _calculate_metrics changes so every cached row is recomputed
+METRICS_VERSION = 1
+
+METRIC_COLUMNS = [column for column, _, _ in PERCENTILE_FEATURES]
+
+
+def past_hash(past_seasons) -> str:
+    payload = json.dumps([METRICS_VERSION, past_seasons], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _to_row(metrics: pd.Series) -> list:
+    return [None if pd.isna(metrics[column]) else float(metrics[column]) for column in METRIC_COLUMNS]
+
+
+class FeatureCache:
+    """
+    Persistent per-entry metrics keyed by entry_id and a hash of its `past`
+    seasons, which only change once a season. `metrics` recomputes only the
+    entries whose history is new or changed.
+    """
+    def __init__(self, db_path: str):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS metrics (entry_id PRIMARY KEY, past_hash TEXT, metrics TEXT)")
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, entry_ids) -> dict:
+        entry_ids = list(dict.fromkeys(entry_ids))
+        cached = {}
+        for start in range(0, len(entry_ids), SQLITE_MAX_VARIABLES):
+            batch = entry_ids[start:start + SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(f"SELECT entry_id, past_hash, metrics FROM metrics WHERE entry_id IN ({placeholders})", batch)
+            for entry_id, hash_value, metrics in rows:
+                cached[entry_id] = (hash_value, json.loads(metrics))
+        return cached
+
+    def metrics(self, histories_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Same result as `pd.concat([entry_id, past.apply(_calculate_metrics)], axis=1)`,
+        served from the cache where the entry's past seasons are unchanged.
+        """
+        cached = self._lookup(histories_df['entry_id'])
+        rows = []
+        updates = []
+        for entry_id, past in zip(histories_df['entry_id'], histories_df['past']):
+            hash_value = past_hash(past)
+            hit = cached.get(entry_id)
+            if hit is not None and hit[0] == hash_value:
+                self.hits += 1
+                row = hit[1]
+            else:
+                self.misses += 1
+                row = _to_row(_calculate_metrics(past))
+                cached[entry_id] = (hash_value, row)
+                updates.append((entry_id, hash_value, json.dumps(row)))
+            rows.append(row)
+
+        if updates:
+            self.conn.executemany("INSERT OR REPLACE INTO metrics VALUES (?, ?, ?)", updates)
+            self.conn.commit()
+
+        metrics_df = pd.DataFrame(rows, columns=METRIC_COLUMNS, dtype=np.float64, index=histories_df.index)
+        return pd.concat([histories_df['entry_id'], metrics_df], axis=1)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,162 @@
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from data_io.jsoncodec import dumps, loads
+
+from .config import FEATURES_CHUNK_SIZE, PERCENTILE_MODE, PERCENTILE_ERROR
+from .odds_classic import PERCENTILE_FEATURES, _calculate_metrics, calculate_percentile_ranks
+from .sketch import QuantileSketch, save_sketches
+from .feature_cache import FeatureCache
+from .utils import SQLITE_MAX_VARIABLES, iter_jsonl_chunks
+
+class _PlayersIndex:
+    """
+    Disk-backed lookup of parsed players by entry_id, so joining a chunk of
+    histories with its players doesn't need the whole players file in memory.
+    """
+    def __init__(self, db_path: str, parsed_players_file: str, chunk_size: int):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("CREATE TABLE players (entry_id PRIMARY KEY, data TEXT)")
+        for chunk in iter_jsonl_chunks(parsed_players_file, chunk_size):
+            # First occurrence wins, the players file is already deduplicated by entry_id
+            self.conn.executemany("INSERT OR IGNORE INTO players VALUES (?, ?)",
+                                  [(player['entry_id'], dumps(player).decode('utf-8')) for player in chunk])
+        self.conn.commit()
+
+    def lookup(self, entry_ids) -> pd.DataFrame:
+        entry_ids = list(dict.fromkeys(entry_ids))
+        players = []
+        for start in range(0, len(entry_ids), SQLITE_MAX_VARIABLES):
+            batch = entry_ids[start:start + SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(f"SELECT data FROM players WHERE entry_id IN ({placeholders})", batch)
+            players.extend(loads(data) for data, in rows)
+        return pd.DataFrame(players)
+
+    def close(self):
+        self.conn.close()
+
+
+def _as_float(series: pd.Series) -> np.ndarray:
+    # astype parses text exactly, unlike pd.to_numeric, so values read back from CSV still tie with the originals
+    return series.replace('', np.nan).astype(np.float64).to_numpy()
+
+
+def _write_csv_chunk(df: pd.DataFrame, path: str, first: bool):
+    df.to_csv(path, mode='w' if first else 'a', header=first, index=False)
+
+
+def score_features(metrics_df: pd.DataFrame, sketches: dict) -> pd.DataFrame:
+    """
+    Add approximate percentile feature columns to `metrics_df` by scoring its
+    metric columns against stored population sketches (see `analytics.sketch.load_sketches`).
+    Cost per entry depends only on the sketch size, not on the population.
+    """
+    for column, lower_is_better, na_option in PERCENTILE_FEATURES:
+        percentile = sketches[column].percentile_rank(_as_float(metrics_df[column]), na_option=na_option)
+        metrics_df[f'percentile_{column}'] = 1.0 - percentile if lower_is_better else percentile
+    return metrics_df
+
+
+def compute_features_chunked(parsed_players_file: str, player_histories_file: str, output_csv_file: str,
+                             chunk_size: int = FEATURES_CHUNK_SIZE, percentile_mode: str = PERCENTILE_MODE,
+                             percentile_error: float = PERCENTILE_ERROR, sketch_file: str = None,
+                             cache_file: str = None) -> int:
+    """
+    Streaming equivalent of `calculate_metrics` over the JSONL files, writing the
+    features CSV and returning the number of rows written.
+
+    Pass 1 reads the histories `chunk_size` entries at a time, computes the
+    per-entry metrics and joins them with the players. With the "exact"
+    percentile mode, pass 2 ranks one metric column at a time for the global
+    percentile features, and pass 3 streams the metrics back out together with
+    their percentiles. Only one metric column is held in memory at once.
+
+    With the "sketch" mode, pass 1 also feeds a QuantileSketch per metric and the
+    second pass scores each chunk against them, so memory no longer depends on
+    the number of entries. The sketches are saved to `sketch_file` if given.
+
+    With `cache_file`, per-entry metrics come from a FeatureCache and only
+    entries whose past seasons changed are recomputed; the percentile passes
+    always rerun over the merged result.
+
+    Rows come out in history-file order.
+    """
+    if percentile_mode not in ('exact', 'sketch'):
+        raise ValueError(f"Unknown percentile mode: {percentile_mode}")
+    sketches = {column: QuantileSketch(error=percentile_error) for column, _, _ in PERCENTILE_FEATURES}
+
+    output_dir = os.path.dirname(os.path.abspath(output_csv_file))
+    with tempfile.TemporaryDirectory(dir=output_dir, prefix=".features-") as tmp_dir:
+        metrics_file = os.path.join(tmp_dir, "metrics.csv")
+
+        # Pass 1: per-entry metrics, chunk by chunk
+        players_index = _PlayersIndex(os.path.join(tmp_dir, "players.db"), parsed_players_file, chunk_size)
+        cache = FeatureCache(cache_file) if cache_file else None
+        num_rows = 0
+        try:
+            for chunk in iter_jsonl_chunks(player_histories_file, chunk_size, columns=['entry_id', 'past']):
+                histories_df = pd.DataFrame(chunk)
+                if cache is not None:
+                    metrics_df = cache.metrics(histories_df)
+                else:
+                    metrics_df = pd.concat([histories_df['entry_id'], histories_df['past'].apply(_calculate_metrics)], axis=1)
+                players_df = players_index.lookup(histories_df['entry_id'])
+                if players_df.empty:
+                    continue
+                # Merge from the metrics side to keep history-file order, with the players' columns first
+                result = pd.merge(metrics_df, players_df, on='entry_id', how='inner')
+                result = result[list(players_df.columns) + [column for column in metrics_df.columns if column != 'entry_id']]
+                if percentile_mode == 'sketch':
+                    for column, _, _ in PERCENTILE_FEATURES:
+                        sketches[column].update(_as_float(result[column]))
+                _write_csv_chunk(result, metrics_file, first=num_rows == 0)
+                num_rows += len(result)
+        finally:
+            players_index.close()
+            if cache is not None:
+                cache.close()
+
+        if num_rows == 0:
+            raise ValueError(f"No player histories in {player_histories_file} match players in {parsed_players_file}")
+
+        partial_output = os.path.join(tmp_dir, "features.csv")
+        if percentile_mode == 'sketch':
+            # Pass 2: score each chunk against the population sketches
+            first = True
+            for chunk in pd.read_csv(metrics_file, chunksize=chunk_size, dtype=str, keep_default_na=False):
+                _write_csv_chunk(score_features(chunk, sketches), partial_output, first=first)
+                first = False
+            if sketch_file:
+                save_sketches(sketches, sketch_file)
+            os.replace(partial_output, output_csv_file)
+            return num_rows
+
+        # Pass 2: global percentile ranks, one column at a time, parked on disk
+        percentile_files = {}
+        for column, lower_is_better, na_option in PERCENTILE_FEATURES:
+            column_df = pd.read_csv(metrics_file, usecols=[column], float_precision='round_trip')
+            percentile = calculate_percentile_ranks(column_df, column, na_option=na_option)
+            percentile = 1.0 - percentile if lower_is_better else percentile
+            percentile_files[column] = os.path.join(tmp_dir, f"percentile_{column}.npy")
+            np.save(percentile_files[column], percentile.to_numpy(dtype=np.float64))
+            del column_df, percentile
+
+        percentiles = {column: np.load(path, mmap_mode='r') for column, path in percentile_files.items()}
+
+        # Pass 3: stream metrics back out with their percentiles; text columns pass through untouched
+        offset = 0
+        for chunk in pd.read_csv(metrics_file, chunksize=chunk_size, dtype=str, keep_default_na=False):
+            for column, _, _ in PERCENTILE_FEATURES:
+                chunk[f'percentile_{column}'] = percentiles[column][offset:offset + len(chunk)]
+            _write_csv_chunk(chunk, partial_output, first=offset == 0)
+            offset += len(chunk)
+
+        del percentiles
+        os.replace(partial_output, output_csv_file)
+
+    return num_rows
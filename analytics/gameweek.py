@@ -0,0 +1,165 @@
+from data_io.storage import iter_jsonl_batches
+
+
+GAMEWEEK_TABLES = ('ownership', 'captains', 'chips')
+
+
+def read_gameweek(gw_number: int, picks_file: str, players_file: str):
+    # Picks of the gameweek and players by entry_id
+    picks_data = []
+    players_data = {}
+
+    for batch in iter_jsonl_batches(picks_file):
+        for picks in batch:
+            if picks['entry_history']['event'] == gw_number:
+                picks_data.append(picks)
+
+    for batch in iter_jsonl_batches(players_file):
+        for player_info in batch:
+            players_data[player_info['entry_id']] = player_info
+
+    return picks_data, players_data
+
+
+def gameweek_tables(gw_number: int, picks_file: str, players_file: str) -> dict:
+    """
+    Build the ownership, captain and chip rows of a gameweek, one list of rows per table.
+    Ownership and captain rows are ordered by count, most picked first.
+    """
+    picks_data, players_data = read_gameweek(gw_number, picks_file, players_file)
+    total_players = len(picks_data)
+    ownership = {}
+    captains = {}
+    chips = []
+
+    for pick in picks_data:
+        for p in pick['picks']:
+            row = ownership.setdefault(p['element'], {'element': p['element'], 'player_name': p['player_name'], 'count': 0})
+            row['count'] += 1
+            if p['is_captain']:
+                row = captains.setdefault(p['element'], {'element': p['element'], 'player_name': p['player_name'], 'count': 0})
+                row['count'] += 1
+        if pick['active_chip']:
+            player_info = players_data[pick['entry_id']]
+            chips.append({'entry_id': pick['entry_id'], 'player_first_name': player_info['player_first_name'],
+                          'player_last_name': player_info['player_last_name'], 'chip': pick['active_chip']})
+
+    def by_count(rows):
+        rows = sorted(rows.values(), key=lambda row: (-row['count'], row['element']))
+        for row in rows:
+            row['percent'] = round(row['count'] / total_players * 100, 2)
+        return rows
+
+    return {'ownership': by_count(ownership), 'captains': by_count(captains), 'chips': chips}
+
+
+def gameweek_summary(gw_number: int, picks_file: str, players_file: str) -> str:
+    """
+    Build the "pregled kola" gameweek review text from the picks and players files.
+    """
+    # Reading the JSONL files
+    picks_data, players_data = read_gameweek(gw_number, picks_file, players_file)
+
+    # Initializing variables
+    total_players = len(picks_data)
+    bank_data = []
+    chips_used = {}
+    ownership_data = {}
+    transfer_in_counts = {}
+    transfer_out_counts = {}
+    captains = {}
+    negative_transfer_points = []
+    effective_ownership = {}
+
+    # Processing each player's data
+    for pick in picks_data:
+        entry_id = pick['entry_id']
+        player_name = f"{players_data[entry_id]['player_first_name']} {players_data[entry_id]['player_last_name']}"
+        entry_history = pick['entry_history']
+
+        # Bank information
+        if entry_history['bank'] > 0:
+            bank_data.append((entry_history['bank'], player_name))
+        
+        # Chips used
+        if pick['active_chip']:
+            chips_used[player_name] = pick['active_chip']
+        
+        # Ownership calculation
+        for p in pick['picks']:
+            if p['element'] not in ownership_data:
+                ownership_data[p['element']] = {'count': 0, 'player_name': p['player_name']}
+            ownership_data[p['element']]['count'] += 1
+        
+        # Effective ownership calculation and captains
+        for p in pick['picks']:
+            if p['is_captain']:
+                if p['player_name'] not in effective_ownership:
+                    effective_ownership[p['player_name']] = 0
+                effective_ownership[p['player_name']] += 2
+                captains[p['player_name']] = captains.get(p['player_name'], 0) + 1
+            else:
+                if p['player_name'] not in effective_ownership:
+                    effective_ownership[p['player_name']] = 0
+                effective_ownership[p['player_name']] += 1
+        
+        # Handle transfer ins/outs
+        for sub in pick.get('automatic_subs', []):
+            transfer_in_counts[sub['element_in']] = transfer_in_counts.get(sub['element_in'], 0) + 1
+            transfer_out_counts[sub['element_out']] = transfer_out_counts.get(sub['element_out'], 0) + 1
+        
+        # Negative transfer points
+        if entry_history['event_transfers_cost'] < 0:
+            negative_transfer_points.append(player_name)
+    
+    # Sort and format the output
+    n_bank = len(bank_data)
+    max_bank_amount, max_bank_player = max(bank_data, default=(0, 'N/A'))
+    
+    chips_used_str = '\n'.join([f"{name}: {chip}" for name, chip in chips_used.items()])
+    ownership_str = '\n'.join([f"{data['player_name']}\n{(data['count'] / total_players) * 100:.2f}% ({data['count']} / {total_players})" 
+                               for data in ownership_data.values() if data['count'] / total_players >= 0.5])
+
+    highest_effective_ownership_player = max(effective_ownership, key=effective_ownership.get)
+    highest_effective_ownership = effective_ownership[highest_effective_ownership_player]
+    element_to_player_name = {}
+    for pick in picks_data:
+        for p in pick['picks']:
+            element_to_player_name[p['element']] = p['player_name']
+
+    most_transferred_in_player = max(transfer_in_counts, key=transfer_in_counts.get, default='N/A')
+    most_transferred_out_player = max(transfer_out_counts, key=transfer_out_counts.get, default='N/A')
+    most_transferred_in_player_name = element_to_player_name.get(most_transferred_in_player, 'N/A')
+    most_transferred_out_player_name = element_to_player_name.get(most_transferred_out_player, 'N/A')
+
+    negative_transfer_points_str = '\n'.join(negative_transfer_points)
+
+    captains_str = '\n'.join([f"{name}: {count / total_players * 100:.2f}%" for name, count in captains.items()])
+    
+    output = f"""KOLO
+{n_bank}/{total_players} igrača ostavilo je para u banci: {max_bank_player} - {max_bank_amount}m £
+
+Iskorišteni chipovi: 
+{chips_used_str}
+
+Ownership igrača (>=50%):
+
+{ownership_str}
+
+
+{highest_effective_ownership_player} effective ownership: {highest_effective_ownership}
+
+TRANSFERI
+/
+
+IGRAČ KOJI JE UŠAO U NAJVIŠE EKIPA - {most_transferred_in_player_name}
+IGRAČ KOJI JE IZAŠAO IZ NAJVIŠE EKIPA - {most_transferred_out_player_name}
+
+MINUS:
+{negative_transfer_points_str}
+
+KAPETANI
+{captains_str}
+"""
+    
+    return output
@@ -0,0 +1,23 @@
+from .utils import read_dataframe
+from .odds_classic import calculate_odds
+from .features import compute_features_chunked
+
+# Entry points for analytics jobs. They take and return plain values so they can
+# be run in a worker process by analytics.pool.AnalyticsPool.
+
+
+def build_features(parsed_players_file: str, player_histories_file: str, output_csv_file: str,
+                   sketch_file: str = None, cache_file: str = None):
+    # Compute features for odds computation chunk by chunk, so memory doesn't grow with the league,
+    # reusing cached metrics for entries whose past seasons haven't changed
+    return compute_features_chunked(parsed_players_file, player_histories_file, output_csv_file,
+                                    sketch_file=sketch_file, cache_file=cache_file)
+
+
+def build_odds(input_file: str, output_file: str):
+    # Load the CSV file into a DataFrame
+    df = read_dataframe(input_file)
+    # Compute the odds of winning the classic league
+    df_odds = calculate_odds(df)
+    df_odds.to_csv(output_file, index=False, encoding='utf-8')
+    return len(df_odds)
@@ -73,6 +73,22 @@ def _calculate_metrics(past_seasons):
     })
 
 
+# Metric columns that get a percentile feature: (column, lower is better, na_option)
+PERCENTILE_FEATURES = [
+    ('maximum_rank', True, 'bottom'),
+    ('maximum_total_points', False, 'top'),
+    ('best_two_seasons_rank', True, 'bottom'),
+    ('best_two_seasons_points', False, 'top'),
+    ('minimum_rank', True, 'bottom'),
+    ('minimum_total_points', False, 'top'),
+    ('number_of_past_seasons', False, 'bottom'),
+    ('moving_total_point_variance', True, 'bottom'),
+    ('moving_total_point_average', False, 'top'),
+    ('moving_rank_variance', True, 'bottom'),
+    ('moving_rank_average', True, 'bottom'),
+]
+
+
 # Function to calculate percentile ranks based on specified order
 def calculate_percentile_ranks(df, column, ascending=True, na_option='bottom'):
     return df[column].rank(pct=True, ascending=ascending, na_option=na_option)
@@ -89,17 +105,9 @@ def calculate_metrics(player_histories_df: pd.DataFrame, parsed_players_df: pd.D
     result = pd.merge(parsed_players_df, player_histories_df, on='entry_id', how='inner')
 
     # Calculate percentile ranks for each feature
-    result['percentile_maximum_rank'] = 1.0 - calculate_percentile_ranks(result, 'maximum_rank')
-    result['percentile_maximum_total_points'] = calculate_percentile_ranks(result, 'maximum_total_points', na_option='top')
-    result['percentile_best_two_seasons_rank'] = 1.0 - calculate_percentile_ranks(result, 'best_two_seasons_rank')
-    result['percentile_best_two_seasons_points'] = calculate_percentile_ranks(result, 'best_two_seasons_points', na_option='top')
-    result['percentile_minimum_rank'] = 1.0 - calculate_percentile_ranks(result, 'minimum_rank')
-    result['percentile_minimum_total_points'] = calculate_percentile_ranks(result, 'minimum_total_points', na_option='top')
-    result['percentile_number_of_past_seasons'] = calculate_percentile_ranks(result, 'number_of_past_seasons')
-    result['percentile_moving_total_point_variance'] = 1.0 - calculate_percentile_ranks(result, 'moving_total_point_variance')
-    result['percentile_moving_total_point_average'] = calculate_percentile_ranks(result, 'moving_total_point_average', na_option='top')
-    result['percentile_moving_rank_variance'] = 1.0 - calculate_percentile_ranks(result, 'moving_rank_variance')
-    result['percentile_moving_rank_average'] = 1.0 - calculate_percentile_ranks(result, 'moving_rank_average')
+    for column, lower_is_better, na_option in PERCENTILE_FEATURES:
+        percentile = calculate_percentile_ranks(result, column, na_option=na_option)
+        result[f'percentile_{column}'] = 1.0 - percentile if lower_is_better else percentile
 
     return result
 
@@ -120,17 +128,13 @@ def weighted_manhattan_distance(data: pd.DataFrame, cols: list, ideal_rank: np.n
     ideal_rank = np.array(ideal_rank)
     weights = np.array(weights)
     
-    # Subset the DataFrame to include only the specified columns
-    data_subset = data[cols]
-    
-    # Define a function to calculate weighted Manhattan distance for a single row
-    def row_weighted_manhattan(row):
-        abs_diff = np.abs(row - ideal_rank)
-        weighted_diff = abs_diff * weights
-        return weighted_diff.sum()
+    # Subset the DataFrame to include only the specified columns; row-major, so each
+    # row sums its columns in the same order as a per-row sum would
+    data_subset = np.ascontiguousarray(data[cols].to_numpy(dtype=np.float64))
     
-    # Apply the function row-wise
-    weighted_manhattan_distances = data_subset.apply(row_weighted_manhattan, axis=1)
+    # Weighted absolute differences for all rows at once, summed per row
+    weighted_diff = np.abs(data_subset - ideal_rank) * weights
+    weighted_manhattan_distances = pd.Series(weighted_diff.sum(axis=1), index=data.index)
     
     return weighted_manhattan_distances
 
@@ -0,0 +1,85 @@
+import asyncio
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import ANALYTICS_WORKERS, ANALYTICS_CONCURRENCY, ANALYTICS_MAX_PENDING, ANALYTICS_TIMEOUT
+
+
+def _run_target(target: str, *args):
+    # Resolve "package.module:function" inside the worker, so the server process never imports it
+    module_name, function_name = target.split(":")
+    return getattr(importlib.import_module(module_name), function_name)(*args)
+
+
+class PoolBusyError(Exception):
+    """Raised when an analytics job is rejected because too many are already queued."""
+
+
+class AnalyticsPool:
+    """
+    Runs CPU-bound analytics jobs in worker processes so they never block the event loop.
+
+    :param max_workers: Number of worker processes.
+    :param max_concurrency: Jobs executing at once; the rest wait for a slot.
+    :param max_pending: Jobs allowed to wait; beyond that `run` raises PoolBusyError.
+    :param timeout: Seconds to wait for a job before raising asyncio.TimeoutError.
+    """
+    def __init__(self, max_workers: int = ANALYTICS_WORKERS, max_concurrency: int = ANALYTICS_CONCURRENCY,
+                 max_pending: int = ANALYTICS_MAX_PENDING, timeout: float = ANALYTICS_TIMEOUT):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pending = 0
+        self._semaphore = None
+        self._executor = None
+
+    @property
+    def executor(self):
+        # Workers are spawned on first use, and with "spawn" so they don't inherit the server's threads
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def run(self, fn, *args):
+        """
+        Run `fn(*args)` in a worker process and return its result.
+        `fn` is either a module-level function or a "package.module:function"
+        string, which is only imported in the worker. Arguments must be picklable.
+        """
+        if isinstance(fn, str):
+            fn, args = _run_target, (fn,) + args
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.pending >= self.max_concurrency + self.max_pending:
+            raise PoolBusyError(f"{self.pending} analytics jobs already running or queued")
+
+        self.pending += 1
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            self.pending -= 1
+            raise
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is held until the worker is done with the job, also when the caller
+        # timed out, so admission control keeps counting jobs still occupying a worker
+        future.add_done_callback(self._release)
+        return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+
+    def _release(self, future=None):
+        self._semaphore.release()
+        self.pending -= 1
+        if future is not None and not future.cancelled():
+            # Mark the outcome as retrieved when nobody waits for it anymore
+            future.exception()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,127 @@
+import os
+
+# Declared column types of the datasets loaded into DataFrames. The loaders in
+# analytics.utils apply them while parsing: ids and counts become small ints,
+# repeated strings (names, teams, statuses) categoricals and timestamps
+# datetimes. Nullable integer types ("Int16") are used where the FPL API leaves
+# values empty. Columns a schema doesn't list keep the type pandas infers, and
+# listed columns missing from a file are ignored.
+
+DATETIME = 'datetime'
+
+PLAYERS = {
+    'entry_id': 'int32',
+    'joined_time': DATETIME,
+    'player_first_name': 'category',
+    'player_last_name': 'category',
+}
+
+PLAYER_HISTORY = {
+    'entry_id': 'int32',
+}
+
+# Metrics stay float64 so percentile ranks and odds come out exactly as before
+FEATURES = {
+    **PLAYERS,
+    'number_of_past_seasons': 'int8',
+}
+
+ODDS = {
+    'entry_id': 'int32',
+    'player_first_name': 'category',
+    'player_last_name': 'category',
+}
+
+# Bootstrap element rows in fpl_players_data.csv
+ELEMENTS = {
+    'id': 'int16',
+    'code': 'int32',
+    'web_name': 'category',
+    'first_name': 'category',
+    'second_name': 'category',
+    'team': 'int8',
+    'team_code': 'int16',
+    'element_type': 'int8',
+    'status': 'category',
+    'now_cost': 'int16',
+    'cost_change_event': 'int8',
+    'cost_change_start': 'int16',
+    'chance_of_playing_this_round': 'Int8',
+    'chance_of_playing_next_round': 'Int8',
+    'selected_by_percent': 'float32',
+    'form': 'float32',
+    'points_per_game': 'float32',
+    'ep_this': 'float32',
+    'ep_next': 'float32',
+    'event_points': 'int16',
+    'total_points': 'int16',
+    'bonus': 'int16',
+    'bps': 'int16',
+    'minutes': 'int16',
+    'goals_scored': 'int16',
+    'assists': 'int16',
+    'clean_sheets': 'int16',
+    'goals_conceded': 'int16',
+    'own_goals': 'int16',
+    'penalties_saved': 'int16',
+    'penalties_missed': 'int16',
+    'yellow_cards': 'int16',
+    'red_cards': 'int16',
+    'saves': 'int16',
+    'transfers_in': 'int32',
+    'transfers_out': 'int32',
+    'transfers_in_event': 'int32',
+    'transfers_out_event': 'int32',
+    'current_timestamp': DATETIME,
+}
+
+# leagues.csv and h2h_leagues.csv
+LEAGUES = {
+    'id': 'int32',
+    'created': DATETIME,
+    'closed': 'bool',
+    'max_entries': 'Int32',
+    'league_type': 'category',
+    'scoring': 'category',
+    'admin_entry': 'Int32',
+    'start_event': 'int8',
+    'code_privacy': 'category',
+    'has_cup': 'bool',
+    'cup_league': 'Int32',
+    'rank': 'Int32',
+    'ko_rounds': 'Int8',
+}
+
+STANDINGS_H2H = {
+    'id': 'int32',
+    'division': 'int32',
+    'entry': 'int32',
+    'player_name': 'category',
+    'rank': 'int32',
+    'last_rank': 'int32',
+    'rank_sort': 'int32',
+    'total': 'int16',
+    'matches_played': 'int8',
+    'matches_won': 'int8',
+    'matches_drawn': 'int8',
+    'matches_lost': 'int8',
+    'points_for': 'int16',
+    'timestamp_requested': DATETIME,
+    'league_id': 'int32',
+}
+
+# Schema picked by the loaders from a file's name
+SCHEMAS = {
+    'players.jsonl': PLAYERS,
+    'player_history.jsonl': PLAYER_HISTORY,
+    'player_histories_and_metrics.csv': FEATURES,
+    'player_odds.csv': ODDS,
+    'fpl_players_data.csv': ELEMENTS,
+    'leagues.csv': LEAGUES,
+    'h2h_leagues.csv': LEAGUES,
+    'standings_h2h.csv': STANDINGS_H2H,
+}
+
+
+def schema_for(file_path: str) -> dict:
+    return SCHEMAS.get(os.path.basename(file_path), {})
@@ -0,0 +1,157 @@
+import json
+import math
+import random
+
+import numpy as np
+
+# Normalised rank error of a KLL sketch is about 1.65 / k at 99% confidence
+_ERROR_CONSTANT = 1.65
+_CAPACITY_DECAY = 2.0 / 3.0
+_MIN_LEVEL_CAPACITY = 2
+
+
+class QuantileSketch:
+    """
+    Mergeable KLL-style quantile sketch over one numeric column.
+
+    Keeps O(k) values no matter how many are added, and answers rank queries
+    within roughly `error` of the population size. NaNs are counted exactly
+    and kept out of the sketch.
+
+    :param error: Target normalised rank error, e.g. 0.01 for 1%.
+    :param seed: Seed for the compaction coin flips, for reproducible sketches.
+    """
+    def __init__(self, error: float = 0.01, seed: int = 0):
+        self.error = error
+        self.k = max(8, math.ceil(_ERROR_CONSTANT / error))
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self.count = 0
+        self.na_count = 0
+        self._frozen = None
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(_MIN_LEVEL_CAPACITY, int(math.ceil(self.k * _CAPACITY_DECAY ** depth)))
+
+    def _size(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self.levels)))
+
+    def _compress(self):
+        while self._size() > self._max_size():
+            for level in range(len(self.levels)):
+                if len(self.levels[level]) >= self._capacity(level):
+                    break
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+
+            items = np.sort(self.levels[level])
+            # An odd item out stays behind so the promoted half keeps exact weight
+            keep = items[:1] if len(items) % 2 else items[:0]
+            items = items[len(keep):]
+            promoted = items[self._rng.randrange(2)::2]
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def update(self, values):
+        """Add an array-like of values; NaN and None are counted as missing."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        missing = np.isnan(values)
+        self.na_count += int(missing.sum())
+        values = values[~missing]
+        self.count += len(values)
+        # Feed level 0 in slices so a huge chunk never sits uncompressed
+        step = max(1, self.k)
+        for start in range(0, len(values), step):
+            self.levels[0] = np.concatenate([self.levels[0], values[start:start + step]])
+            self._compress()
+        self._frozen = None
+        return self
+
+    def merge(self, other: 'QuantileSketch'):
+        """Fold another sketch (e.g. from another chunk or worker) into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.na_count += other.na_count
+        self._compress()
+        self._frozen = None
+        return self
+
+    def _freeze(self):
+        if self._frozen is None:
+            values = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+            order = np.argsort(values, kind='stable')
+            values, weights = values[order], weights[order]
+            cumulative = np.concatenate([[0.0], np.cumsum(weights)])
+            # Rescale so weights add up to the exact number of values seen
+            if cumulative[-1] > 0:
+                cumulative *= self.count / cumulative[-1]
+            self._frozen = (values, cumulative)
+        return self._frozen
+
+    def average_rank(self, values) -> np.ndarray:
+        """
+        Approximate 1-based ascending rank of each value among the non-missing
+        population, averaging ties like `Series.rank(method='average')`.
+        """
+        sketch_values, cumulative = self._freeze()
+        values = np.asarray(values, dtype=np.float64)
+        below = cumulative[np.searchsorted(sketch_values, values, side='left')]
+        at_or_below = cumulative[np.searchsorted(sketch_values, values, side='right')]
+        return below + (at_or_below - below + 1.0) / 2.0
+
+    def percentile_rank(self, values, na_option: str = 'bottom') -> np.ndarray:
+        """
+        Approximate `Series.rank(pct=True, na_option=...)` of `values` against the
+        population in the sketch; NaNs in `values` are ranked like pandas does.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        total = self.count + self.na_count
+        if total == 0:
+            return np.full(values.shape, np.nan)
+
+        ranks = self.average_rank(values)
+        na_rank = (self.na_count + 1.0) / 2.0
+        if na_option == 'top':
+            ranks = ranks + self.na_count
+        else:
+            na_rank += self.count
+        ranks = np.where(np.isnan(values), na_rank, ranks)
+        return np.clip(ranks / total, 0.0, 1.0)
+
+    def to_dict(self) -> dict:
+        return {
+            'error': self.error,
+            'k': self.k,
+            'seed': self.seed,
+            'count': self.count,
+            'na_count': self.na_count,
+            'levels': [items.tolist() for items in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'QuantileSketch':
+        sketch = cls(error=data['error'], seed=data['seed'])
+        sketch.k = data['k']
+        sketch.count = data['count']
+        sketch.na_count = data['na_count']
+        sketch.levels = [np.asarray(items, dtype=np.float64) for items in data['levels']]
+        return sketch
+
+
+def save_sketches(sketches: dict, file_path: str):
+    with open(file_path, 'w') as file:
+        json.dump({column: sketch.to_dict() for column, sketch in sketches.items()}, file)
+
+
+def load_sketches(file_path: str) -> dict:
+    with open(file_path, 'r') as file:
+        return {column: QuantileSketch.from_dict(data) for column, data in json.load(file).items()}
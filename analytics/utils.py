@@ -1,17 +1,51 @@
 import pandas as pd
-import json
 
-# Function to read JSONL files into a list of dictionaries
+from data_io.storage import iter_jsonl_batches, read_jsonl_records
+from .schemas import DATETIME, schema_for
+
+# SQLite caps the number of bound parameters per statement
+SQLITE_MAX_VARIABLES = 900
+
+# Function to read JSONL files (plain or compressed) into a list of dictionaries, parsed in bulk
 def read_jsonl(file_path):
-    with open(file_path, 'r') as file:
-        return [json.loads(line) for line in file]
+    return read_jsonl_records(file_path)
+
+def apply_schema(df, schema):
+    # Cast the columns a schema declares, in place
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        if dtype == DATETIME:
+            df[column] = pd.to_datetime(df[column], format='ISO8601')
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
 
-def jsonl_to_df(file_path):
+def jsonl_to_df(file_path, schema=None):
     # Load the JSONL file
     data = read_jsonl(file_path)
-    # Convert the list of dictionaries to a DataFrame
+    # Convert the list of dictionaries to a DataFrame with the file's declared column types
     df = pd.DataFrame(data)
-    return df
+    return apply_schema(df, schema_for(file_path) if schema is None else schema)
+
+def read_dataframe(file_path, schema=None):
+    # Parse straight into the file's declared column types (see analytics.schemas)
+    schema = schema_for(file_path) if schema is None else schema
+    header = pd.read_csv(file_path, nrows=0).columns
+    dtype = {column: dtype for column, dtype in schema.items() if dtype != DATETIME}
+    parse_dates = [column for column, dtype in schema.items() if dtype == DATETIME and column in header]
+    return pd.read_csv(file_path, dtype=dtype, parse_dates=parse_dates, date_format='ISO8601')
 
-def read_dataframe(file_path):
-    return pd.read_csv(file_path)
\ No newline at end of file
+def iter_jsonl_chunks(file_path, chunk_size, columns=None):
+    # Yield lists of at most chunk_size records, optionally keeping only some keys
+    chunk = []
+    for batch in iter_jsonl_batches(file_path):
+        for record in batch:
+            if columns is not None:
+                record = {column: record.get(column) for column in columns}
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,192 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from analytics.config import READ_CACHE_MB
+from analytics.pool import AnalyticsPool, PoolBusyError
+from api.results import MAX_OFFSET, MAX_PAGE_SIZE, ResponseCache, file_signature, lookup, store, query_csv, render_page
+from data_io.jsoncodec import dumps, loads
+from data_io.standings import StandingsStore
+from data_io.storage import find_jsonl
+
+import os
+import asyncio
+import logging
+
+# Analytics code (and with it pandas/numpy) is only imported inside the worker
+# processes; jobs are referenced by "module:function" name.
+FEATURES_JOB = "analytics.jobs:build_features"
+ODDS_JOB = "analytics.jobs:build_odds"
+GAMEWEEK_SUMMARY_JOB = "analytics.gameweek:gameweek_summary"
+GAMEWEEK_TABLES_JOB = "analytics.gameweek:gameweek_tables"
+
+router = APIRouter()
+
+# Get a logger instance
+logger = logging.getLogger(__name__)
+
+# Process pool for CPU-bound analytics, started on first use
+analytics_pool = AnalyticsPool()
+
+# Rank history of H2H standings; picks up rows written by the ingestion workers on each query
+standings_store = StandingsStore()
+
+# Responses of the read endpoints, keyed by endpoint and query and dropped once their files change
+results_cache = ResponseCache(int(READ_CACHE_MB * 1024 * 1024))
+
+
+async def run_analytics(job: str, *args):
+    # Run an analytics job in the worker pool, mapping admission and timeout failures to HTTP errors
+    try:
+        return await analytics_pool.run(job, *args)
+    except PoolBusyError as e:
+        logger.warning("Rejected analytics job %s: %s", job, e)
+        raise HTTPException(status_code=503, detail="Analytics workers are busy, try again later")
+    except asyncio.TimeoutError:
+        logger.error("Analytics job %s timed out after %s seconds", job, analytics_pool.timeout)
+        raise HTTPException(status_code=504, detail="Analytics job timed out")
+
+
+@router.get("/suze/analytics/odds")
+async def compute_odds():
+    try:
+        logger.info("Received request to compute odds of winning classic")
+        # Define the input CSV file paths
+        input_file = os.path.join("data", "player_histories_and_metrics.csv")
+        output_file = os.path.join("data", "player_odds.csv")
+        # Compute the odds of winning the classic league in a worker process
+        await run_analytics(ODDS_JOB, input_file, output_file)
+        return {"message": "Odds computed successfully", "results": "/suze/analytics/odds/results"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to compute odds of winning classic. Error: %s", e)
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
+
+@router.get("/suze/analytics/features")
+async def compute_features():
+    try:
+        logger.info("Received request to extract features from players history")
+
+        # Ensure the data directory exists
+        os.makedirs("data", exist_ok=True)
+
+        # Define file paths
+        parsed_players_file = os.path.join("data", "players.jsonl")
+        player_histories_file = os.path.join("data", "player_history.jsonl")
+        output_csv_file = os.path.join("data", "player_histories_and_metrics.csv")
+        sketch_file = os.path.join("data", "percentile_sketches.json")
+        cache_file = os.path.join("data", "feature_cache.db")
+
+        # Compute features for odds computation in a worker process
+        await run_analytics(FEATURES_JOB, parsed_players_file, player_histories_file, output_csv_file,
+                            sketch_file, cache_file)
+        return {"message": "Features computed successfully", "results": "/suze/analytics/features/results"}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to compute features for odds computation. Error: %s", e)
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
+
+@router.get("/suze/pregled-kola/{gw_number}")
+async def pregled_kola(gw_number: str, request: Request):
+    picks_file = os.path.join("data", "picks_history.jsonl")
+    players_file = os.path.join("data", "players.jsonl")
+
+    # The summary only changes with its input files, so repeated requests are served from the cache
+    try:
+        signature = file_signature(find_jsonl(picks_file)[0], find_jsonl(players_file)[0])
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"{os.path.basename(e.filename)} has not been written yet")
+    key = ("pregled-kola", int(gw_number))
+    etag, response = lookup(results_cache, key, signature, request.headers.get("if-none-match"))
+    if response is not None:
+        return response
+
+    output = await run_analytics(GAMEWEEK_SUMMARY_JOB, int(gw_number), picks_file, players_file)
+    return store(results_cache, key, signature, etag, "application/json", dumps({"message": output}))
+
+@router.get("/suze/pregled-kola/{gw_number}/results")
+async def pregled_kola_results(gw_number: int, request: Request,
+                               table: str = Query(pattern="^(ownership|captains|chips)$"),
+                               offset: int = Query(default=0, ge=0, le=MAX_OFFSET), limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+                               output_format: str = Query(default="json", alias="format", pattern="^(json|ndjson)$")):
+    picks_file = os.path.join("data", "picks_history.jsonl")
+    players_file = os.path.join("data", "players.jsonl")
+
+    try:
+        signature = file_signature(find_jsonl(picks_file)[0], find_jsonl(players_file)[0])
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"{os.path.basename(e.filename)} has not been written yet")
+    key = ("pregled-kola-results", gw_number, table, offset, limit, output_format)
+    etag, response = lookup(results_cache, key, signature, request.headers.get("if-none-match"))
+    if response is not None:
+        return response
+
+    # All tables of a gameweek are built in one pass; they are cached together so paging doesn't rebuild them
+    tables_key = ("pregled-kola-tables", gw_number)
+    cached = results_cache.get(tables_key, signature)
+    if cached is not None:
+        tables = loads(cached[1])
+    else:
+        tables = await run_analytics(GAMEWEEK_TABLES_JOB, gw_number, picks_file, players_file)
+        results_cache.put(tables_key, signature, "application/json", dumps(tables))
+    rows = tables[table]
+    page = render_page(len(rows), offset, limit, rows[offset:offset + limit], output_format)
+    return store(results_cache, key, signature, etag, *page)
+
+
+def read_results(request: Request, name: str, file_path: str, entry_id: list, columns: list, sort: str,
+                 offset: int, limit: int, output_format: str):
+    # Serve a page of a results CSV, from the ETag or the cache when the file hasn't changed
+    try:
+        signature = file_signature(file_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"{os.path.basename(file_path)} has not been computed yet")
+    key = (name, tuple(sorted(entry_id)), tuple(columns), sort, offset, limit, output_format)
+    etag, response = lookup(results_cache, key, signature, request.headers.get("if-none-match"))
+    if response is not None:
+        return response
+
+    try:
+        total, rows = query_csv(file_path, entry_ids=entry_id, columns=columns, sort=sort, offset=offset, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return store(results_cache, key, signature, etag, *render_page(total, offset, limit, rows, output_format))
+
+
+# Read endpoints parse the CSVs without pandas, so they run in the threadpool rather than the pool
+
+@router.get("/suze/analytics/odds/results")
+def read_odds(request: Request, entry_id: list[int] = Query(default=[]), columns: list[str] = Query(default=[]),
+              sort: str = None, offset: int = Query(default=0, ge=0, le=MAX_OFFSET), limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+              output_format: str = Query(default="json", alias="format", pattern="^(json|ndjson)$")):
+    input_file = os.path.join("data", "player_odds.csv")
+    return read_results(request, "odds", input_file, entry_id, columns, sort, offset, limit, output_format)
+
+@router.get("/suze/analytics/features/results")
+def read_features(request: Request, entry_id: list[int] = Query(default=[]), columns: list[str] = Query(default=[]),
+                  sort: str = None, offset: int = Query(default=0, ge=0, le=MAX_OFFSET), limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+                  output_format: str = Query(default="json", alias="format", pattern="^(json|ndjson)$")):
+    input_file = os.path.join("data", "player_histories_and_metrics.csv")
+    return read_results(request, "features", input_file, entry_id, columns, sort, offset, limit, output_format)
+
+
+# Rank history queries only touch the in-memory index, so they run in the threadpool instead of the pool
+
+@router.get("/suze/analytics/entry/{entry_id}/rank-history")
+def rank_history(entry_id: int, league_id: int = None):
+    try:
+        logger.info("Received request for rank history of entry_id: %s", entry_id)
+        return {"entry_id": entry_id, "history": standings_store.trajectory(entry_id, league_id=league_id)}
+    except Exception as e:
+        logger.error("Failed to read rank history for entry_id: %s. Error: %s", entry_id, e)
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
+
+@router.get("/suze/analytics/h2h-league/{league_id}/movers")
+def league_movers(league_id: int, limit: int = 10):
+    try:
+        logger.info("Received request for rank movers of league_id: %s", league_id)
+        return standings_store.movers(league_id, limit=limit)
+    except Exception as e:
+        logger.error("Failed to compute rank movers for league_id: %s. Error: %s", league_id, e)
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
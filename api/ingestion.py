@@ -0,0 +1,608 @@
+from fastapi import APIRouter, HTTPException, Query
+from data_io.bulk import fetch_leagues, dedupe_members, fetch_entries
+from data_io.league import LEAGUE_FIELDNAMES, STANDINGS_FIELDNAMES, H2H_LEAGUE_FIELDNAMES
+from data_io.league import get_league_data, get_h2h_matches, get_fpl_master_data
+from data_io.players import extract_player_data, get_player_history, get_transfer_history, get_picks_history
+from data_io.singleflight import SingleFlight, coalesced
+from data_io.standings import StandingsStore
+from data_io.jsoncodec import dumps, loads
+from data_io.storage import file_lock, atomic_write, LockedAppender, JsonlWriter, iter_jsonl_lines, read_jsonl_records
+
+from contextlib import ExitStack
+from datetime import datetime
+
+import os
+import csv
+import logging
+
+router = APIRouter()
+
+# Get a logger instance
+logger = logging.getLogger(__name__)
+
+# Rank history of H2H standings, appended to by write_h2h_file
+standings_store = StandingsStore()
+
+# Concurrent identical ingestion requests run once and share the response, so
+# two clients triggering the same league don't page it and append it twice
+ingestion_jobs = SingleFlight()
+
+
+def filter_max_timestamp_and_map_id_to_webname(csv_file):
+    # Dictionary to hold the max timestamp entry for each player
+    max_timestamp_entries = {}
+
+    # Open the CSV file
+    with open(csv_file, 'r') as csvfile:
+        reader = csv.DictReader(csvfile)
+        
+        for row in reader:
+            player_id = int(row['id'])
+            web_name = row['web_name']
+            current_timestamp = row['current_timestamp']
+
+            # Parse the timestamp
+            timestamp = datetime.fromisoformat(current_timestamp.replace("Z", "+00:00"))
+
+            # Check if this player is already in the dictionary
+            if player_id in max_timestamp_entries:
+                # Compare timestamps and keep the entry with the max timestamp
+                existing_timestamp = max_timestamp_entries[player_id]['current_timestamp']
+                if timestamp > existing_timestamp:
+                    max_timestamp_entries[player_id] = {'current_timestamp': timestamp, 'web_name': web_name}
+            else:
+                # Add new entry to the dictionary
+                max_timestamp_entries[player_id] = {'current_timestamp': timestamp, 'web_name': web_name}
+
+    # Create a mapping of id to web_name with the max timestamp
+    id_to_webname = {player_id: data['web_name'] for player_id, data in max_timestamp_entries.items()}
+
+    return id_to_webname
+
+
+# Ingestion handlers are plain functions: FastAPI runs them in its threadpool,
+# so their blocking network and file I/O stays off the event loop.
+
+@router.get("/suze/classic-league/players")
+@coalesced(ingestion_jobs)
+def write_players_file():
+    try:
+        logger.info("Received request to extract and write player data")
+
+        # Ensure the data directory exists
+        os.makedirs("data", exist_ok=True)
+
+        # Define file paths
+        input_file_path = os.path.join("data", "classic_league.jsonl")
+        output_file_path = os.path.join("data", "players.jsonl")
+        existing_entry_ids = set()
+
+        # Extract player data and write to the output file
+        with JsonlWriter(output_file_path, 'w') as outfile:
+            for json_data in read_jsonl_records(input_file_path):
+                players = extract_player_data(json_data)
+                new_players = [player for player in players if player['entry_id'] not in existing_entry_ids]
+                existing_entry_ids.update(player['entry_id'] for player in new_players)
+                outfile.write_records(new_players)
+                logger.debug("Written %s players to file", len(new_players))
+
+        logger.info("Successfully wrote player data to %s", output_file_path)
+        return {"message": "Players data written successfully"}
+
+    except Exception as e:
+        logger.error("Failed to write player data. Error: %s", e)
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
+
+
+@router.get("/suze/classic-league/player_history")
+@coalesced(ingestion_jobs)
+def write_player_history_file():
+    try:
+        logger.info("Received request to extract and write player history data")
+
+        # Define file paths
+        input_file_path = os.path.join("data", "players.jsonl")
+        output_file_path = os.path.join("data", "player_history.jsonl")
+
+        # Extract player history and write to the output file
+        with LockedAppender(output_file_path) as outfile:
+            for player in read_jsonl_records(input_file_path):
+                player_history = get_player_history(player['entry_id'])
+                outfile.write_records([player_history])
+                logger.debug("Written player history data for entry_id: %s", player['entry_id'])
+
+        logger.info("Successfully wrote player history data to %s", output_file_path)
+        return {"message": "Player history data written successfully"}
+
+    except Exception as e:
+        logger.error("Failed to write player history data. Error: %s", e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+    
+
+@router.get("/suze/classic-league/transfer_history")
+@coalesced(ingestion_jobs)
+def write_transfer_history_file():
+    try:
+        logger.info("Received request to extract and write transfer history data")
+
+        # Define file paths
+        input_file_path = os.path.join("data", "players.jsonl")
+        output_file_path = os.path.join("data", "transfer_history.jsonl")
+
+        # Extract transfer history and write to the output file
+        with LockedAppender(output_file_path) as outfile:
+            for player in read_jsonl_records(input_file_path):
+                player_history = get_transfer_history(player['entry_id'])
+                outfile.write_records(player_history)
+                logger.debug("Written transfer history data for entry_id: %s", player['entry_id'])
+
+        logger.info("Successfully wrote transfer history data to %s", output_file_path)
+        return {"message": "Transfer history data written successfully"}
+
+    except Exception as e:
+        logger.error("Failed to write transfer history data. Error: %s", e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+    
+
+@router.get("/suze/static-data")
+@coalesced(ingestion_jobs)
+def get_static_data():
+    try:
+        logger.info("Received request toget all fpl player data")
+
+        # Define file paths
+        output_file_path = os.path.join("data", "static_data.json")
+        output_fpl_players_path = os.path.join("data", "fpl_players_data.csv")
+
+        # Extract picks history and write to the output file
+        master_data = get_fpl_master_data()
+        with atomic_write(output_file_path, 'wb') as outfile:
+            outfile.write(dumps(master_data) + b'\n')
+        
+        logger.info("Successfully wrote picks history data to %s", output_file_path)
+
+        # Check if the CSV file already exists, under the lock so only one writer adds the header
+        with file_lock(output_fpl_players_path), open(output_fpl_players_path, 'a', newline='') as csvfile:
+            file_exists = csvfile.tell() > 0
+            current_timestamp = datetime.now().isoformat()
+            players = master_data['elements']
+            # Define the fieldnames (i.e., CSV column headers)
+            fieldnames = list(players[0].keys()) + ['current_timestamp']
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            # If the file doesn't exist, write the header
+            if not file_exists:
+                writer.writeheader()
+            for player in players:
+                player['current_timestamp'] = current_timestamp
+                writer.writerow(player)
+
+        logger.info("Successfully wrote FPL player data to %s", output_fpl_players_path)
+        return {"message": "Static data written successfully"}
+
+    except Exception as e:
+        logger.error("Failed to write static data. Error: %s", e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+    
+
+@router.get("/suze/classic-league/picks_history/{gw_number}")
+@coalesced(ingestion_jobs)
+def write_picks_history_file(gw_number: str):
+    try:
+        logger.info("Received request to extract and write picks history data")
+
+        # Define file paths
+        players_file_path = os.path.join("data", "players.jsonl")
+        fpl_players_path = os.path.join("data", "fpl_players_data.csv")
+        output_file_path = os.path.join("data", "picks_history.jsonl")
+
+        player_id_to_name = filter_max_timestamp_and_map_id_to_webname(fpl_players_path)
+
+        # Extract picks history and write to the output file
+        with LockedAppender(output_file_path) as outfile:
+            for player in read_jsonl_records(players_file_path):
+                picks_history = get_picks_history(gw_number=gw_number, entry_id=player['entry_id'])
+                for j in range(len(picks_history["picks"])):
+                    picks_history["picks"][j]['player_name'] = player_id_to_name.get(picks_history["picks"][j]['element'], 'Unknown')
+                outfile.write_records([picks_history])
+                logger.debug("Written picks history data for entry_id: %s", player['entry_id'])
+
+        logger.info("Successfully wrote picks history data to %s", output_file_path)
+        return {"message": "Picks history data written successfully"}
+
+    except Exception as e:
+        logger.error("Failed to write picks history data. Error: %s", e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+            
+
+def store_classic_league_pages(league_id, league_data):
+    """
+    Append classic league standings pages to classic_league.jsonl and fold the
+    new lines into leagues.csv. Shared by the single-league and bulk endpoints.
+    """
+    # Ensure the data directory exists
+    os.makedirs("data", exist_ok=True)
+
+    # Appending pages, folding them into leagues.csv and advancing state.txt is one
+    # read-modify-write, so concurrent workers take turns through the JSONL file's lock
+    jsonl_file_path = os.path.join("data", "classic_league.jsonl")
+    with file_lock(jsonl_file_path):
+        # Write to the file
+        # Append each JSON object to the JSONL file
+        with JsonlWriter(jsonl_file_path) as f:
+            f.write_records(league_data)
+            logger.debug("Written %s standings pages to file for league_id: %s", len(league_data), league_id)
+    
+        logger.info("Successfully wrote data for league_id: %s to %s", league_id, jsonl_file_path)
+    
+        # Load existing data from CSV into a dictionary with league id as key
+        data = {}
+        csv_file_path = os.path.join("data", "leagues.csv")
+        if os.path.exists(csv_file_path):
+            with open(csv_file_path, mode='r', newline='', encoding='utf-8') as csvfile:
+                reader = csv.DictReader(csvfile)
+                for row in reader:
+                    data[int(row['id'])] = row
+    
+            logger.info("Read in previous league entries from %s", csv_file_path)
+            logger.info("There are %s entries in the league file.", len(data))
+    
+        # Determine the starting line number
+        start_line = 0
+        state_file_path = os.path.join("data", "state.txt")
+        if os.path.exists(state_file_path):
+            with open(state_file_path, 'r', encoding='utf-8') as statefile:
+                start_line = int(statefile.read().strip())
+            logger.info("There are %s lines already processed in the JSONL file.", start_line+1)
+    
+        # Process the JSONL file incrementally; compressed files skip processed blocks without reading them
+        current_line_number = start_line - 1
+        for current_line_number, line in iter_jsonl_lines(jsonl_file_path, start=start_line):
+            entry = loads(line)
+            league = entry['league']
+            league_id = league['id']
+            created_timestamp = datetime.fromisoformat(league['created'].replace('Z', '+00:00'))
+
+            # Check if this league id exists in the data
+            if league_id in data:
+                existing_timestamp = datetime.fromisoformat(data[league_id]['created'].replace('Z', '+00:00'))
+                if created_timestamp > existing_timestamp:
+                    # Update the entry with the new data
+                    data[league_id] = league
+                    logger.info("Updated %s with latest data.", league_id)
+            else:
+                # Add a new entry
+                data[league_id] = league
+                logger.info("Adding %s information.", league_id)
+
+        # Write the updated data back to the CSV file
+        with atomic_write(csv_file_path, newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=LEAGUE_FIELDNAMES)
+            writer.writeheader()
+            for league_id, league in data.items():
+                writer.writerow(league)
+    
+        logger.info("Successfully wrote data to %s", csv_file_path)
+    
+        # Update the state file with the last processed line number
+        with atomic_write(state_file_path, encoding='utf-8') as statefile:
+            statefile.write(str(current_line_number + 1))  # +1 to store the next starting line
+    
+        logger.info("Updated state file with last processed line number: %s", current_line_number + 1)
+
+
+@router.get("/suze/classic-league/{league_id}")
+@coalesced(ingestion_jobs)
+def write_league_file(league_id: str):
+    try:
+        logger.info("Received request to fetch and write classic league data for league_id: %s", league_id)
+        
+        # Call your function from get_classic_league to get the data
+        league_data = get_league_data(league_id=league_id, league_type='leagues-classic')
+        logger.info("Successfully retrieved data for league_id: %s", league_id)
+
+        store_classic_league_pages(league_id, league_data)
+
+        return {"message": "Classic league written successfully"}
+
+    except Exception as e:
+        logger.error("Failed to write data for league_id: %s. Error: %s", league_id, e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+    
+def store_h2h_league_pages(league_id, league_data):
+    """
+    Append H2H league standings pages to h2h_leagues.jsonl, fold the new lines
+    into h2h_leagues.csv and record their standings. Shared by the single-league
+    and bulk endpoints.
+    """
+    # Ensure the data directory exists
+    os.makedirs("data", exist_ok=True)
+
+    # Appending pages, folding them into the CSVs and advancing state_h2h.txt is one
+    # read-modify-write, so concurrent workers take turns through the JSONL file's lock
+    jsonl_file_path = os.path.join("data", "h2h_leagues.jsonl")
+    with file_lock(jsonl_file_path):
+        # Write to the file
+        # Append each JSON object to the JSONL file
+        with JsonlWriter(jsonl_file_path) as f:
+            f.write_records(league_data)
+            logger.debug("Written %s standings pages to file for league_id: %s", len(league_data), league_id)
+    
+        logger.info("Successfully wrote data for league_id: %s to %s", league_id, jsonl_file_path)
+    
+        # Load existing data from CSV into a dictionary with league id as key
+        data = {}
+        csv_file_path = os.path.join("data", "h2h_leagues.csv")
+        if os.path.exists(csv_file_path):
+            with open(csv_file_path, mode='r', newline='', encoding='utf-8') as csvfile:
+                reader = csv.DictReader(csvfile)
+                for row in reader:
+                    data[int(row['id'])] = row
+    
+            logger.info("Read in previous league entries from %s", csv_file_path)
+            logger.info("There are %s entries in the league file.", len(data))
+    
+        # Determine the starting line number
+        start_line = 0
+        state_file_path = os.path.join("data", "state_h2h.txt")
+        if os.path.exists(state_file_path):
+            with open(state_file_path, 'r', encoding='utf-8') as statefile:
+                start_line = int(statefile.read().strip())
+            logger.info("There are %s lines already processed in the JSONL file.", start_line+1)
+    
+        # Process the JSONL file incrementally
+        standings_csv_path = os.path.join("data", "standings_h2h.csv")
+        # Standings from all processed lines form one snapshot and are written once at the end
+        current_time = datetime.now().isoformat()
+        standings_rows = []
+        # Compressed files skip processed blocks without reading them
+        current_line_number = start_line - 1
+        for current_line_number, line in iter_jsonl_lines(jsonl_file_path, start=start_line):
+            entry = loads(line)
+            league = entry['league']
+            league_id = league['id']
+            standings = entry.get('standings', {})
+            created_timestamp = datetime.fromisoformat(league['created'].replace('Z', '+00:00'))
+
+            # Check if this league id exists in the data
+            if league_id in data:
+                existing_timestamp = datetime.fromisoformat(data[league_id]['created'].replace('Z', '+00:00'))
+                if created_timestamp > existing_timestamp:
+                    # Update the entry with the new data
+                    data[league_id] = league
+                    logger.info("Updated %s with latest data.", league_id)
+            else:
+                # Add a new entry
+                data[league_id] = league
+                logger.info("Adding %s information.", league_id)
+            
+            if standings:
+                # Loop through the results in the standings data and tag each row with the timestamp
+                for result in standings.get("results", []):
+                    result['timestamp_requested'] = current_time
+                    result['league_id'] = league_id
+                    standings_rows.append(result)
+
+        if standings_rows:
+            # Check if the standings file exists to determine the write mode
+            write_mode = 'a' if os.path.exists(standings_csv_path) else 'w'
+
+            # Write the standings data
+            with open(standings_csv_path, mode=write_mode, newline='', encoding='utf-8') as standings_file:
+                writer = csv.DictWriter(standings_file, fieldnames=STANDINGS_FIELDNAMES)
+
+                # Write the header only if the file is newly created
+                if write_mode == 'w':
+                    writer.writeheader()
+                writer.writerows(standings_rows)
+
+            logger.info("Successfully wrote standings data to %s", standings_csv_path)
+
+            # Rank history queries read the time-series store instead of scanning the CSV
+            standings_store.append(dict(row, timestamp=current_time, event=row.get('matches_played'))
+                                   for row in standings_rows)
+
+        # Write the updated data back to the CSV file
+        with atomic_write(csv_file_path, newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=H2H_LEAGUE_FIELDNAMES)
+            writer.writeheader()
+            for league_id, league in data.items():
+                writer.writerow(league)
+    
+        logger.info("Successfully wrote data to %s", csv_file_path)
+    
+        # Update the state file with the last processed line number
+        with atomic_write(state_file_path, encoding='utf-8') as statefile:
+            statefile.write(str(current_line_number + 1))  # +1 to store the next starting line
+    
+        logger.info("Updated state file with last processed line number: %s", current_line_number + 1)
+
+
+@router.get("/suze/h2h-league/{league_id}")
+@coalesced(ingestion_jobs)
+def write_h2h_file(league_id: str):
+    try:
+        logger.info("Received request to fetch and write h2h league data for league_id: %s", league_id)
+        
+        # Call your function from get_classic_league to get the data
+        league_data = get_league_data(league_id=league_id, league_type='leagues-h2h')
+        logger.info("Successfully retrieved data for league_id: %s", league_id)
+
+        store_h2h_league_pages(league_id, league_data)
+
+        return {"message": "H2H league written successfully"}
+
+    except Exception as e:
+        logger.error("Failed to write data for league_id: %s. Error: %s", league_id, e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/suze/h2h-league/{league_id}/matches")
+@coalesced(ingestion_jobs)
+def write_h2h_file(league_id: str):
+    try:
+        logger.info("Received request to fetch and write h2h league matches for league_id: %s", league_id)
+        
+        # Call your function from get_classic_league to get the data
+        match_pages = get_h2h_matches(league_id=league_id)
+        logger.info("Successfully retrieved data for league_id: %s", league_id)
+
+        # Ensure the data directory exists
+        os.makedirs("data", exist_ok=True)
+
+        matches_csv_path = os.path.join("data", "matches_h2h.csv")
+
+        # Get the current timestamp
+        timestamp_requested = datetime.now().isoformat()
+
+        # Reading existing matches and appending new ones happens under the CSV's lock
+        with file_lock(matches_csv_path):
+            # Check if the CSV file already exists
+            file_exists = os.path.exists(matches_csv_path)
+
+            # Open the CSV file in append mode
+            with open(matches_csv_path, mode='a', newline='') as file:
+                fieldnames = ['id', 'entry_1_entry', 'entry_1_name', 'entry_1_player_name', 
+                            'entry_1_points', 'entry_1_win', 'entry_1_draw', 'entry_1_loss', 
+                            'entry_1_total', 'entry_2_entry', 'entry_2_name', 'entry_2_player_name', 
+                            'entry_2_points', 'entry_2_win', 'entry_2_draw', 'entry_2_loss', 
+                            'entry_2_total', 'is_knockout', 'league', 'winner', 'seed_value', 
+                            'event', 'tiebreak', 'is_bye', 'knockout_name', 'timestamp_requested']
+
+                writer = csv.DictWriter(file, fieldnames=fieldnames)
+
+                # Write the header if the file doesn't exist yet
+                if not file_exists:
+                    writer.writeheader()
+
+                # Read existing entries if file exists
+                existing_entries = set()
+                if file_exists:
+                    with open(matches_csv_path, mode='r') as read_file:
+                        reader = csv.DictReader(read_file)
+                        for row in reader:
+                            key = (row['league'], row['event'], row['entry_1_entry'], row['entry_2_entry'])
+                            existing_entries.add(key)
+
+                # Write each match to the CSV if it doesn't already exist
+                for matches in match_pages:
+                    for match in matches['results']:
+                        key = (str(match['league']), str(match['event']), str(match['entry_1_entry']), str(match['entry_2_entry']))
+                        # append new gws
+                        if key not in existing_entries:
+                            empty_entry_cols = [
+                                "entry_1_points", "entry_1_win", "entry_1_draw", "entry_1_loss", "entry_1_total",
+                                "entry_2_points", "entry_2_win", "entry_2_draw", "entry_2_loss", "entry_2_total"
+                            ]
+                            to_write = False
+                            for col in empty_entry_cols:
+                                if str(match[col]) != '0':
+                                    to_write = True
+                                    break
+                            if to_write:
+                                match['timestamp_requested'] = timestamp_requested
+                                writer.writerow(match)
+
+                return {"message": "H2H league matches written successfully"}
+
+    except Exception as e:
+        logger.error("Failed to write data for league_id: %s. Error: %s", league_id, e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/suze/bulk-ingest")
+@coalesced(ingestion_jobs)
+def bulk_ingest(classic: list[int] = Query(default=[]), h2h: list[int] = Query(default=[]), gw_number: str = None,
+                history: bool = True, transfers: bool = True):
+    try:
+        logger.info("Received bulk ingestion request for classic leagues %s and h2h leagues %s", classic, h2h)
+        leagues = [('classic', league_id) for league_id in classic] + [('h2h', league_id) for league_id in h2h]
+        if not leagues:
+            raise HTTPException(status_code=400, detail="Pass at least one classic or h2h league id")
+
+        # Standings of all leagues are fetched concurrently, then stored league by league
+        pages_by_league, league_errors = fetch_leagues(leagues)
+        for (kind, league_id), league_data in pages_by_league.items():
+            if kind == 'classic':
+                store_classic_league_pages(league_id, league_data)
+            else:
+                store_h2h_league_pages(league_id, league_data)
+        if any(kind == 'classic' for kind, _ in pages_by_league):
+            write_players_file()
+
+        # Entries in several leagues are fetched once and attributed to all of them
+        entry_ids, memberships = dedupe_members(pages_by_league)
+        members_csv_path = os.path.join("data", "league_members.csv")
+        with file_lock(members_csv_path):
+            members = set()
+            if os.path.exists(members_csv_path):
+                with open(members_csv_path, 'r', newline='', encoding='utf-8') as csvfile:
+                    members = {(row['league_type'], int(row['league_id']), int(row['entry_id'])) for row in csv.DictReader(csvfile)}
+            members.update((kind, league_id, entry_id) for entry_id, entry_leagues in memberships.items()
+                           for kind, league_id in entry_leagues)
+            with atomic_write(members_csv_path, newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(['league_type', 'league_id', 'entry_id'])
+                writer.writerows(sorted(members))
+        logger.info("%s entries across %s leagues, %s of them unique", sum(map(len, memberships.values())),
+                    len(pages_by_league), len(entry_ids))
+
+        fetchers = {}
+        output_paths = {}
+        if history:
+            fetchers['history'] = get_player_history
+            output_paths['history'] = os.path.join("data", "player_history.jsonl")
+        if transfers:
+            fetchers['transfers'] = get_transfer_history
+            output_paths['transfers'] = os.path.join("data", "transfer_history.jsonl")
+        if gw_number is not None:
+            fpl_players_path = os.path.join("data", "fpl_players_data.csv")
+            player_id_to_name = filter_max_timestamp_and_map_id_to_webname(fpl_players_path)
+            fetchers['picks'] = lambda entry_id: get_picks_history(gw_number=gw_number, entry_id=entry_id)
+            output_paths['picks'] = os.path.join("data", "picks_history.jsonl")
+
+        fetched = {name: 0 for name in fetchers}
+        failed = {name: 0 for name in fetchers}
+        failed_entries = set()
+        with ExitStack() as stack:
+            outfiles = {name: stack.enter_context(LockedAppender(path)) for name, path in output_paths.items()}
+            for name, entry_id, result, error in fetch_entries(entry_ids, fetchers):
+                if error is not None:
+                    failed[name] += 1
+                    failed_entries.add(entry_id)
+                    continue
+                if name == 'transfers':
+                    outfiles[name].write_records(result)
+                else:
+                    if name == 'picks':
+                        for j in range(len(result["picks"])):
+                            result["picks"][j]['player_name'] = player_id_to_name.get(result["picks"][j]['element'], 'Unknown')
+                    outfiles[name].write_records([result])
+                fetched[name] += 1
+
+        # Attribute the fetched entries back to every league they belong to
+        league_summaries = {league: {'league_type': league[0], 'league_id': league[1], 'entries': 0,
+                                     'shared_entries': 0, 'failed_entries': 0}
+                            for league in pages_by_league}
+        for entry_id, entry_leagues in memberships.items():
+            for league in entry_leagues:
+                summary = league_summaries[league]
+                summary['entries'] += 1
+                summary['shared_entries'] += len(entry_leagues) > 1
+                summary['failed_entries'] += entry_id in failed_entries
+
+        logger.info("Bulk ingestion fetched %s for %s unique entries", fetched, len(entry_ids))
+        return {
+            "message": "Bulk ingestion finished",
+            "unique_entries": len(entry_ids),
+            "fetched": fetched,
+            "failed": failed,
+            "leagues": list(league_summaries.values()),
+            "league_errors": [{'league_type': kind, 'league_id': league_id, 'error': error}
+                              for (kind, league_id), error in league_errors.items()],
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed bulk ingestion. Error: %s", e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -0,0 +1,184 @@
+import csv
+import hashlib
+import heapq
+import os
+import threading
+from collections import OrderedDict
+
+from fastapi import Response
+
+from data_io.jsoncodec import dumps, dump_lines
+
+# Read side of the analytics results. Responses are cached by the files they
+# were built from: a file's (mtime, size, inode) is part of the ETag, so a
+# rewritten file changes every ETag built on it and its cached responses are
+# dropped on the next lookup.
+
+MAX_PAGE_SIZE = 1000
+# Sorted pages keep offset + limit rows in memory, so deeper pages need a filter instead
+MAX_OFFSET = 100000
+
+
+def file_signature(*paths) -> tuple:
+    """
+    Identify the current version of `paths`. Raises FileNotFoundError if one is missing.
+    """
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((path, stat.st_mtime_ns, stat.st_size, stat.st_ino))
+    return tuple(signature)
+
+
+def make_etag(signature: tuple, params: tuple) -> str:
+    digest = hashlib.sha1(repr((signature, params)).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    # Weak comparison, as for GET requests
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of response bodies, bounded by their total size.
+
+    :param max_bytes: Total size of the cached bodies; least recently used ones are evicted beyond it.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, signature):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] != signature:
+                # The underlying files changed since this was cached
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, signature, media_type: str, body: bytes, headers: dict = None):
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (signature, (media_type, body, headers or {}))
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        _, (_, body, _) = self.entries.pop(key)
+        self.size -= len(body)
+
+
+def _parse_value(value: str):
+    # CSV values come back as JSON numbers where they parse as such
+    if value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    # NaN and infinities aren't valid JSON
+    return number if number == number and abs(number) != float('inf') else None
+
+
+def query_csv(path: str, entry_ids=None, columns=None, sort: str = None, offset: int = 0, limit: int = 100):
+    """
+    Stream a results CSV and return (total matching rows, rows of the requested page).
+
+    :param entry_ids: Only keep rows with these entry_ids.
+    :param columns: Only return these columns (unknown ones are ignored).
+    :param sort: Column to sort by, prefixed with '-' for descending; file order otherwise.
+    """
+    entry_ids = {str(entry_id) for entry_id in entry_ids} if entry_ids else None
+    descending = bool(sort) and sort.startswith('-')
+    sort_column = sort.lstrip('-') if sort else None
+    total = 0
+    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        fieldnames = reader.fieldnames or []
+        if sort_column is not None and sort_column not in fieldnames:
+            raise ValueError(f"Unknown sort column: {sort_column}")
+        selected = [column for column in fieldnames if not columns or column in columns]
+
+        def matching():
+            nonlocal total
+            for row in reader:
+                if entry_ids is not None and row.get('entry_id') not in entry_ids:
+                    continue
+                total += 1
+                yield row
+
+        if sort_column is None:
+            page = []
+            for index, row in enumerate(matching()):
+                if offset <= index < offset + limit:
+                    page.append(row)
+        else:
+            # Keep only the top offset + limit rows, numbers before strings, missing values last either way
+            def sort_key(item):
+                index, row = item
+                value = _parse_value(row[sort_column])
+                present = value is not None
+                group = 1 if isinstance(value, str) else 0
+                if descending:
+                    # nlargest takes the largest keys first, so strings get the lower group key here
+                    return (present, -group, value if present else 0, -index)
+                return (not present, group, value if present else 0, index)
+
+            select = heapq.nlargest if descending else heapq.nsmallest
+            top = select(offset + limit, enumerate(matching()), key=sort_key)
+            page = [row for _, row in top[offset:offset + limit]]
+
+    return total, [{column: _parse_value(row[column]) for column in selected} for row in page]
+
+
+def render_page(total: int, offset: int, limit: int, rows: list, output_format: str):
+    # (media type, body, headers) of one page as a JSON document or as NDJSON, one row per line
+    if output_format == 'ndjson':
+        return 'application/x-ndjson', dump_lines(rows), {'X-Total-Count': str(total)}
+    body = dumps({'total': total, 'offset': offset, 'limit': limit, 'items': rows})
+    return 'application/json', body, {'X-Total-Count': str(total)}
+
+
+def lookup(cache: ResponseCache, key, signature, if_none_match: str = None):
+    """
+    Answer a read request from its ETag or the cache where possible.
+
+    :return: (etag, Response or None); None means the caller builds the body and calls `store`.
+    """
+    etag = make_etag(signature, key)
+    if etag_matches(if_none_match, etag):
+        return etag, Response(status_code=304, headers={'ETag': etag})
+    cached = cache.get(key, signature)
+    if cached is not None:
+        media_type, body, headers = cached
+        return etag, Response(content=body, media_type=media_type, headers=dict(headers, ETag=etag))
+    return etag, None
+
+
+def store(cache: ResponseCache, key, signature, etag: str, media_type: str, body: bytes, headers: dict = None):
+    # Cache a freshly built body and return it as the response
+    cache.put(key, signature, media_type, body, headers)
+    return Response(content=body, media_type=media_type, headers=dict(headers or {}, ETag=etag))
@@ -0,0 +1,41 @@
+import argparse
+import json
+import sys
+
+
+def load_results(path: str) -> dict:
+    with open(path, 'r') as f:
+        report = json.load(f)
+    return {result['name']: result for result in report['results']}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files produced by benchmarks.run.")
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Exit non-zero if any benchmark is slower than baseline by more than this fraction")
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.baseline)
+    candidate = load_results(args.candidate)
+
+    regressions = []
+    print(f"{'benchmark':<55} {'baseline s':>12} {'candidate s':>12} {'speedup':>9}")
+    for name, result in candidate.items():
+        if name not in baseline:
+            print(f"{name:<55} {'-':>12} {result['seconds']:>12.4f} {'-':>9}")
+            continue
+        before, after = baseline[name]['seconds'], result['seconds']
+        speedup = before / after if after > 0 else float('inf')
+        print(f"{name:<55} {before:>12.4f} {after:>12.4f} {speedup:>8.2f}x")
+        if after > before * (1 + args.threshold):
+            regressions.append(name)
+
+    if regressions:
+        print(f"Regressions beyond {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from . import synthetic
+
+# Routes mirror the FPL API paths used by data_io, relative to the /api prefix
+ROUTES = [
+    ('standings', re.compile(r'^/api/(leagues-classic|leagues-h2h)/(\d+)/standings/$')),
+    ('h2h_matches', re.compile(r'^/api/leagues-h2h-matches/league/(\d+)/$')),
+    ('history', re.compile(r'^/api/entry/(\d+)/history/$')),
+    ('transfers', re.compile(r'^/api/entry/(\d+)/transfers/$')),
+    ('picks', re.compile(r'^/api/entry/(\d+)/event/(\d+)/picks/$')),
+    ('bootstrap', re.compile(r'^/api/bootstrap-static/$')),
+]
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket; a rate of None disables limiting.
+    """
+    def __init__(self, rate: float = None, burst: int = None):
+        self.rate = rate
+        self.capacity = burst or (rate if rate else 0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        if not self.rate:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class MockFPLServer:
+    """
+    Local stand-in for the FPL API serving synthetic payloads.
+
+    :param num_entries: Number of entries in every league served.
+    :param latency: Seconds to sleep before answering each request.
+    :param rate_limit: Maximum requests per second before answering 429, or None.
+    :param burst: Bucket size for the rate limiter, defaults to one second's worth.
+    """
+    def __init__(self, num_entries: int, latency: float = 0.0, rate_limit: float = None, burst: int = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.num_entries = num_entries
+        self.latency = latency
+        self.bucket = TokenBucket(rate_limit, burst)
+        self.counters = {}
+        self.counters_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def count(self, key: str):
+        with self.counters_lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    def reset_counters(self):
+        with self.counters_lock:
+            counters, self.counters = self.counters, {}
+        return counters
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def payload(self, route: str, groups: tuple, query: dict):
+        if route == 'standings':
+            league_type, league_id = groups
+            return synthetic.league_standings(int(league_id), league_type, self.num_entries,
+                                              int(query.get('page_standings', 1)), int(query.get('page_new_entries', 1)))
+        if route == 'h2h_matches':
+            return synthetic.h2h_matches(int(groups[0]), self.num_entries, int(query.get('page', 1)))
+        if route == 'history':
+            return synthetic.entry_history(int(groups[0]))
+        if route == 'transfers':
+            return synthetic.entry_transfers(int(groups[0]))
+        if route == 'picks':
+            return synthetic.entry_picks(int(groups[0]), int(groups[1]))
+        return synthetic.bootstrap_static()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                # data_io builds malformed query strings ("?{key}=1&?{key}=1"), keep only the real params
+                query = {key.lstrip('?'): values[-1] for key, values in parse_qs(parts.query).items()}
+
+                for route, pattern in ROUTES:
+                    match = pattern.match(parts.path)
+                    if match:
+                        break
+                else:
+                    server.count('not_found')
+                    return self._send(404, {"detail": "Not found."})
+
+                if not server.bucket.take():
+                    server.count('rate_limited')
+                    return self._send(429, {"detail": "Too many requests."})
+
+                if server.latency:
+                    time.sleep(server.latency)
+                server.count(route)
+                self._send(200, server.payload(route, match.groups(), query))
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,228 @@
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+import requests
+
+from . import synthetic
+from .mock_server import MockFPLServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_SCHEMA_VERSION = 1
+
+ENDPOINTS = [
+    # (name, path template, what counts as one item)
+    ('static-data', '/suze/static-data', 'elements'),
+    ('classic-league', '/suze/classic-league/{league_id}', 'entries'),
+    ('players', '/suze/classic-league/players', 'entries'),
+    ('player-history', '/suze/classic-league/player_history', 'entries'),
+    ('transfer-history', '/suze/classic-league/transfer_history', 'entries'),
+    ('picks-history', '/suze/classic-league/picks_history/{gw_number}', 'entries'),
+    ('h2h-league', '/suze/h2h-league/{league_id}', 'entries'),
+    ('h2h-matches', '/suze/h2h-league/{league_id}/matches', 'entries'),
+    ('features', '/suze/analytics/features', 'entries'),
+    ('odds', '/suze/analytics/odds', 'entries'),
+    # Read endpoints scan the whole results file for a sorted page
+    ('features-results', '/suze/analytics/features/results?sort=-maximum_total_points&limit=1000', 'entries'),
+    ('odds-results', '/suze/analytics/odds/results?sort=-entry_id&limit=1000', 'entries'),
+    ('pregled-kola', '/suze/pregled-kola/{gw_number}', 'entries'),
+    ('pregled-kola-results', '/suze/pregled-kola/{gw_number}/results?table=ownership', 'entries'),
+    ('rank-history', '/suze/analytics/entry/{entry_id}/rank-history', 'entry'),
+    ('movers', '/suze/analytics/h2h-league/{league_id}/movers', 'entries'),
+    # Last, as it appends a second copy of every entry's history, transfers and picks
+    ('bulk-ingest', '/suze/bulk-ingest?classic={league_id}&h2h={league_id}&gw_number={gw_number}', 'entries'),
+]
+
+ANALYTICS = ['calculate_metrics', 'calculate_odds', 'read_elements']
+
+
+def parse_scale(value: str) -> int:
+    if value in synthetic.SCALES:
+        return synthetic.SCALES[value]
+    return int(value)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _start_app(port: int):
+    # Imported late so that FPL_API_URL is already pointing at the mock server
+    import uvicorn
+    from app import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("uvicorn failed to start")
+        time.sleep(0.01)
+    return server, thread
+
+
+def _result(name, kind, seconds, items, **extra):
+    result = {
+        "name": name,
+        "kind": kind,
+        "seconds": round(seconds, 6),
+        "items": items,
+        "items_per_second": round(items / seconds, 3) if seconds > 0 else None,
+    }
+    result.update(extra)
+    return result
+
+
+def bench_endpoints(base_url: str, mock: MockFPLServer, num_entries: int, league_id: int, gw_number: int, selected):
+    results = []
+    for name, template, unit in ENDPOINTS:
+        if name not in selected:
+            continue
+        path = template.format(league_id=league_id, gw_number=gw_number, entry_id=synthetic.FIRST_ENTRY_ID)
+        items = {'elements': synthetic.NUM_ELEMENTS, 'entry': 1}.get(unit, num_entries)
+        mock.reset_counters()
+        start = time.perf_counter()
+        response = requests.get(base_url + path, timeout=None)
+        seconds = time.perf_counter() - start
+        results.append(_result(f"GET {template}", "endpoint", seconds, items,
+                               status=response.status_code, unit=unit, upstream_requests=mock.reset_counters()))
+        print(f"{name:>18}: {response.status_code} in {seconds:.3f}s", file=sys.stderr)
+    return results
+
+
+def bench_analytics(data_dir: str, repeat: int, selected):
+    # Analytics functions are timed in-process on the files produced by the ingestion run
+    from analytics.schemas import FEATURES
+    from analytics.utils import jsonl_to_df, read_dataframe
+    from data_io.storage import jsonl_exists
+    from analytics.odds_classic import calculate_metrics, calculate_odds
+
+    players_file = os.path.join(data_dir, "players.jsonl")
+    histories_file = os.path.join(data_dir, "player_history.jsonl")
+    if not (jsonl_exists(players_file) and jsonl_exists(histories_file)):
+        print("skipping analytics: players.jsonl/player_history.jsonl were not produced", file=sys.stderr)
+        return []
+
+    parsed_players_df = jsonl_to_df(players_file)
+    player_histories_df = jsonl_to_df(histories_file)
+    items = len(parsed_players_df)
+    features_df = calculate_metrics(player_histories_df, parsed_players_df)
+    # Kept apart from the endpoint's player_histories_and_metrics.csv, but loaded with its schema
+    features_file = os.path.join(data_dir, "bench_features.csv")
+    features_df.to_csv(features_file, index=False)
+
+    elements_file = os.path.join(data_dir, "fpl_players_data.csv")
+
+    # name: (reported name, function timed, items it processes)
+    cases = {
+        'calculate_metrics': ("analytics.odds_classic.calculate_metrics",
+                              lambda: calculate_metrics(player_histories_df, parsed_players_df), items),
+        'calculate_odds': ("analytics.odds_classic.calculate_odds",
+                           lambda: calculate_odds(read_dataframe(features_file, schema=FEATURES)), items),
+        'read_elements': ("analytics.utils.read_dataframe(fpl_players_data.csv)",
+                          lambda: read_dataframe(elements_file), synthetic.NUM_ELEMENTS),
+    }
+    if not os.path.exists(elements_file):
+        print("skipping read_elements: fpl_players_data.csv was not produced", file=sys.stderr)
+        del cases['read_elements']
+
+    results = []
+    for name in ANALYTICS:
+        if name not in selected or name not in cases:
+            continue
+        label, case, case_items = cases[name]
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            case()
+            timings.append(time.perf_counter() - start)
+        results.append(_result(label, "analytics", min(timings), case_items,
+                               repeat=repeat, median_seconds=round(statistics.median(timings), 6)))
+        print(f"{name:>18}: {min(timings):.3f}s (best of {repeat})", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark app.py endpoints and analytics against a mock FPL API.")
+    parser.add_argument('--scale', default='small', help="Entries per league: small (100), medium (10k), large (1M) or a number")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Latency added to every mock upstream response")
+    parser.add_argument('--rate-limit', type=float, default=None, help="Mock upstream requests per second before 429s")
+    parser.add_argument('--burst', type=int, default=None, help="Rate limiter bucket size")
+    parser.add_argument('--league-id', type=int, default=314)
+    parser.add_argument('--gw-number', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3, help="Repetitions for in-process analytics timings")
+    parser.add_argument('--only', nargs='*', help="Run only these benchmarks (endpoint or analytics names)")
+    parser.add_argument('--skip', nargs='*', default=[], help="Skip these benchmarks")
+    parser.add_argument('--workdir', help="Directory to run in (defaults to a fresh temporary directory)")
+    parser.add_argument('--output', help="Write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    num_entries = parse_scale(args.scale)
+    names = [name for name, _, _ in ENDPOINTS] + ANALYTICS
+    selected = set(args.only or names) - set(args.skip)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="suze-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    output = os.path.abspath(args.output) if args.output else None
+
+    mock = MockFPLServer(num_entries, latency=args.latency_ms / 1000.0, rate_limit=args.rate_limit, burst=args.burst).start()
+    os.environ["FPL_API_URL"] = mock.url
+    sys.path.insert(0, REPO_ROOT)
+    # app.py writes to relative data/ and app.log paths, and not every endpoint creates data/
+    os.chdir(workdir)
+    os.makedirs("data", exist_ok=True)
+
+    port = _free_port()
+    server, thread = _start_app(port)
+    try:
+        results = bench_endpoints(f"http://127.0.0.1:{port}", mock, num_entries, args.league_id, args.gw_number, selected)
+        results += bench_analytics(os.path.join(workdir, "data"), args.repeat, selected)
+    finally:
+        server.should_exit = True
+        thread.join()
+        mock.stop()
+
+    report = {
+        "schema": RESULTS_SCHEMA_VERSION,
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "num_entries": num_entries,
+            "latency_ms": args.latency_ms,
+            "rate_limit": args.rate_limit,
+            "burst": args.burst,
+            "workdir": workdir,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from .run import REPO_ROOT, RESULTS_SCHEMA_VERSION, _result
+
+# Modules that must stay out of the server process: analytics runs them in worker processes
+HEAVY_MODULES = ['pandas', 'numpy']
+
+# Runs in a fresh interpreter so nothing is already imported or cached
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import app
+seconds = time.perf_counter() - start
+print(json.dumps({
+    "seconds": seconds,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_modules": [name for name in %r if name in sys.modules],
+    "routes": sorted(app.app.openapi()["paths"]),
+}))
+"""
+
+
+def measure(routers: str, repeat: int) -> dict:
+    env = dict(os.environ, SUZE_ROUTERS=routers, PYTHONPATH=REPO_ROOT)
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="suze-startup-") as workdir:
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, "-c", _PROBE % (HEAVY_MODULES,)], cwd=workdir, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            runs.append(json.loads(output.splitlines()[-1]))
+    best = min(runs, key=lambda run: run["seconds"])
+    best["max_rss_mb"] = min(run["max_rss_mb"] for run in runs)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import time and memory of app.py per router set.")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-ingestion-seconds', type=float, default=None,
+                        help="Fail if the ingestion-only app takes longer than this to import")
+    parser.add_argument('--max-ingestion-rss-mb', type=float, default=None,
+                        help="Fail if the ingestion-only app uses more memory than this after import")
+    parser.add_argument('--output', help="Write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = []
+    failures = []
+    for routers in ['ingestion', 'ingestion,analytics']:
+        run = measure(routers, args.repeat)
+        results.append(_result(f"startup[{routers}]", "startup", run["seconds"], 1, max_rss_mb=round(run["max_rss_mb"], 1),
+                               heavy_modules=run["heavy_modules"], num_routes=len(run["routes"])))
+        print(f"{routers:>20}: {run['seconds']:.3f}s, {run['max_rss_mb']:.1f} MB, heavy modules: {run['heavy_modules']}",
+              file=sys.stderr)
+        if run["heavy_modules"]:
+            failures.append(f"{routers} imported {', '.join(run['heavy_modules'])} at startup")
+
+    ingestion = results[0]
+    if args.max_ingestion_seconds is not None and ingestion["seconds"] > args.max_ingestion_seconds:
+        failures.append(f"ingestion startup took {ingestion['seconds']:.3f}s > {args.max_ingestion_seconds}s")
+    if args.max_ingestion_rss_mb is not None and ingestion["max_rss_mb"] > args.max_ingestion_rss_mb:
+        failures.append(f"ingestion startup used {ingestion['max_rss_mb']} MB > {args.max_ingestion_rss_mb} MB")
+
+    text = json.dumps({"schema": RESULTS_SCHEMA_VERSION, "meta": {"python": sys.version.split()[0]}, "results": results}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if failures:
+        print("Startup guard failed: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
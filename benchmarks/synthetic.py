@@ -0,0 +1,295 @@
+import random
+
+# Synthetic FPL payloads. Every payload is derived from a seeded RNG keyed by the
+# object it describes, so the same scale always produces byte-identical data and
+# nothing has to be held in memory to serve a 1M entry league.
+
+SCALES = {
+    "small": 100,
+    "medium": 10_000,
+    "large": 1_000_000,
+}
+
+PAGE_SIZE = 50
+NEW_ENTRIES_PAGE_SIZE = 50
+NUM_ELEMENTS = 600
+NUM_TEAMS = 20
+NUM_EVENTS = 38
+FIRST_ENTRY_ID = 1_000_000
+
+POSITIONS = [1, 2, 3, 4]
+CHIPS = [None, None, None, None, None, 'wildcard', 'freehit', 'bboost', '3xc']
+FIRST_NAMES = ['Ivan', 'Marko', 'Luka', 'Ana', 'Petra', 'Josip', 'Tomislav', 'Maja', 'Filip', 'Nikola']
+LAST_NAMES = ['Horvat', 'Kovacevic', 'Babic', 'Maric', 'Juric', 'Novak', 'Kovacic', 'Knezevic', 'Vukovic', 'Markovic']
+
+
+def _rng(*key):
+    # Integer keys only: str hashes are salted per process and would break reproducibility
+    seed = 0
+    for k in key:
+        seed = (seed * 1_000_003) ^ k
+    return random.Random(seed)
+
+
+def entry_ids(num_entries: int):
+    return range(FIRST_ENTRY_ID, FIRST_ENTRY_ID + num_entries)
+
+
+def _player_name(entry_id: int):
+    rng = _rng(entry_id, 1)
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+
+def _league(league_id: int, league_type: str):
+    league = {
+        "id": league_id,
+        "name": f"Synthetic {league_type} {league_id}",
+        "created": "2024-07-20T10:00:00.000000Z",
+        "closed": False,
+        "max_entries": None,
+        "league_type": "x",
+        "scoring": "h" if league_type == 'leagues-h2h' else "c",
+        "admin_entry": FIRST_ENTRY_ID,
+        "start_event": 1,
+        "code_privacy": "p",
+        "has_cup": False,
+        "cup_league": None,
+        "rank": None,
+    }
+    if league_type == 'leagues-h2h':
+        league["ko_rounds"] = None
+    return league
+
+
+def _classic_result(entry_id: int, rank: int):
+    first_name, last_name = _player_name(entry_id)
+    rng = _rng(entry_id, 2)
+    return {
+        "id": entry_id * 10,
+        "event_total": rng.randint(20, 110),
+        "player_name": f"{first_name} {last_name}",
+        "rank": rank,
+        "last_rank": max(1, rank + rng.randint(-5, 5)),
+        "rank_sort": rank,
+        "total": rng.randint(200, 2500),
+        "entry": entry_id,
+        "entry_name": f"Team {entry_id}",
+    }
+
+
+def _h2h_result(entry_id: int, rank: int, league_id: int):
+    first_name, last_name = _player_name(entry_id)
+    rng = _rng(entry_id, league_id, 3)
+    won, drawn, lost = rng.randint(0, 20), rng.randint(0, 5), rng.randint(0, 20)
+    return {
+        "id": entry_id * 10,
+        "division": league_id,
+        "entry": entry_id,
+        "player_name": f"{first_name} {last_name}",
+        "rank": rank,
+        "last_rank": max(1, rank + rng.randint(-3, 3)),
+        "rank_sort": rank,
+        "total": won * 3 + drawn,
+        "entry_name": f"Team {entry_id}",
+        "matches_played": won + drawn + lost,
+        "matches_won": won,
+        "matches_drawn": drawn,
+        "matches_lost": lost,
+        "points_for": rng.randint(200, 2500),
+    }
+
+
+def _num_pages(num_items: int, page_size: int):
+    return max(1, -(-num_items // page_size))
+
+
+def league_standings(league_id: int, league_type: str, num_entries: int, page_standings: int, page_new_entries: int):
+    """
+    Build one page of a classic or H2H standings response.
+    New entries are limited to the first page's worth so that pagination over
+    standings dominates, as it does upstream for established leagues.
+    """
+    ids = entry_ids(num_entries)
+    num_pages = _num_pages(num_entries, PAGE_SIZE)
+    start = (page_standings - 1) * PAGE_SIZE
+    page_ids = ids[start:start + PAGE_SIZE]
+
+    if league_type == 'leagues-h2h':
+        results = [_h2h_result(entry_id, start + i + 1, league_id) for i, entry_id in enumerate(page_ids)]
+    else:
+        results = [_classic_result(entry_id, start + i + 1) for i, entry_id in enumerate(page_ids)]
+
+    new_entry_ids = ids[-min(num_entries, NEW_ENTRIES_PAGE_SIZE):] if page_new_entries == 1 else []
+    new_entries = []
+    for entry_id in new_entry_ids:
+        first_name, last_name = _player_name(entry_id)
+        new_entries.append({
+            "entry": entry_id,
+            "entry_name": f"Team {entry_id}",
+            "joined_time": "2024-08-01T12:00:00.000000Z",
+            "player_first_name": first_name,
+            "player_last_name": last_name,
+        })
+
+    return {
+        "new_entries": {"has_next": False, "page": page_new_entries, "results": new_entries},
+        "last_updated_data": "2024-10-01T12:00:00Z",
+        "league": _league(league_id, league_type),
+        "standings": {"has_next": page_standings < num_pages, "page": page_standings, "results": results},
+    }
+
+
+def h2h_matches(league_id: int, num_entries: int, page: int, num_events: int = 3):
+    """
+    Build one page of H2H fixtures: entries are paired in order for each event.
+    """
+    ids = entry_ids(num_entries)
+    pairs_per_event = num_entries // 2
+    total = pairs_per_event * num_events
+    start = (page - 1) * PAGE_SIZE
+    results = []
+    for match_index in range(start, min(start + PAGE_SIZE, total)):
+        event, pair = divmod(match_index, pairs_per_event)
+        entry_1, entry_2 = ids[2 * pair], ids[2 * pair + 1]
+        rng = _rng(league_id, match_index, 4)
+        points_1, points_2 = rng.randint(20, 110), rng.randint(20, 110)
+        results.append({
+            "id": match_index + 1,
+            "entry_1_entry": entry_1,
+            "entry_1_name": f"Team {entry_1}",
+            "entry_1_player_name": " ".join(_player_name(entry_1)),
+            "entry_1_points": points_1,
+            "entry_1_win": int(points_1 > points_2),
+            "entry_1_draw": int(points_1 == points_2),
+            "entry_1_loss": int(points_1 < points_2),
+            "entry_1_total": points_1,
+            "entry_2_entry": entry_2,
+            "entry_2_name": f"Team {entry_2}",
+            "entry_2_player_name": " ".join(_player_name(entry_2)),
+            "entry_2_points": points_2,
+            "entry_2_win": int(points_2 > points_1),
+            "entry_2_draw": int(points_1 == points_2),
+            "entry_2_loss": int(points_2 < points_1),
+            "entry_2_total": points_2,
+            "is_knockout": False,
+            "league": league_id,
+            "winner": entry_1 if points_1 >= points_2 else entry_2,
+            "seed_value": None,
+            "event": event + 1,
+            "tiebreak": None,
+            "is_bye": False,
+            "knockout_name": "",
+        })
+    return {"has_next": start + PAGE_SIZE < total, "page": page, "results": results}
+
+
+def entry_history(entry_id: int, current_event: int = 10):
+    rng = _rng(entry_id, 5)
+    total = 0
+    current = []
+    for event in range(1, current_event + 1):
+        points = rng.randint(20, 110)
+        total += points
+        current.append({
+            "event": event,
+            "points": points,
+            "total_points": total,
+            "rank": rng.randint(1, 10_000_000),
+            "rank_sort": rng.randint(1, 10_000_000),
+            "overall_rank": rng.randint(1, 10_000_000),
+            "bank": rng.randint(0, 30),
+            "value": rng.randint(990, 1050),
+            "event_transfers": rng.randint(0, 3),
+            "event_transfers_cost": rng.choice([0, 0, 0, -4]),
+            "points_on_bench": rng.randint(0, 20),
+        })
+
+    num_past = rng.randint(0, 8)
+    past = []
+    for i in range(num_past):
+        start_year = 2023 - num_past + 1 + i
+        past.append({
+            "season_name": f"{start_year}/{(start_year + 1) % 100:02d}",
+            "total_points": rng.randint(1200, 2700),
+            "rank": rng.randint(1, 10_000_000),
+        })
+
+    return {"current": current, "past": past, "chips": []}
+
+
+def entry_transfers(entry_id: int, current_event: int = 10):
+    rng = _rng(entry_id, 6)
+    transfers = []
+    for event in range(2, current_event + 1):
+        for _ in range(rng.randint(0, 2)):
+            transfers.append({
+                "element_in": rng.randint(1, NUM_ELEMENTS),
+                "element_in_cost": rng.randint(40, 140),
+                "element_out": rng.randint(1, NUM_ELEMENTS),
+                "element_out_cost": rng.randint(40, 140),
+                "entry": entry_id,
+                "event": event,
+                "time": f"2024-09-{event:02d}T10:00:00.000000Z",
+            })
+    return transfers
+
+
+def entry_picks(entry_id: int, event: int):
+    rng = _rng(entry_id, event, 7)
+    # Skew selections towards a popular core so ownership and captaincy look realistic
+    core = list(range(1, 31))
+    elements = rng.sample(core, 8) + rng.sample(range(31, NUM_ELEMENTS + 1), 7)
+    captain = rng.randrange(11)
+    picks = [{
+        "element": element,
+        "position": position + 1,
+        "multiplier": 0 if position >= 11 else (2 if position == captain else 1),
+        "is_captain": position == captain,
+        "is_vice_captain": position == (captain + 1) % 11,
+    } for position, element in enumerate(elements)]
+    automatic_subs = []
+    if rng.random() < 0.3:
+        automatic_subs.append({"entry": entry_id, "element_in": elements[11], "element_out": elements[rng.randrange(11)], "event": event})
+    return {
+        "active_chip": rng.choice(CHIPS),
+        "automatic_subs": automatic_subs,
+        "entry_history": {
+            "event": event,
+            "points": rng.randint(20, 110),
+            "total_points": rng.randint(200, 2500),
+            "rank": rng.randint(1, 10_000_000),
+            "rank_sort": rng.randint(1, 10_000_000),
+            "overall_rank": rng.randint(1, 10_000_000),
+            "bank": rng.choice([0, 0, 0, rng.randint(1, 30)]),
+            "value": rng.randint(990, 1050),
+            "event_transfers": rng.randint(0, 3),
+            "event_transfers_cost": rng.choice([0, 0, 0, -4]),
+            "points_on_bench": rng.randint(0, 20),
+        },
+        "picks": picks,
+    }
+
+
+def bootstrap_static(num_elements: int = NUM_ELEMENTS):
+    rng = _rng(8)
+    elements = []
+    for element_id in range(1, num_elements + 1):
+        elements.append({
+            "id": element_id,
+            "web_name": f"Player{element_id}",
+            "first_name": rng.choice(FIRST_NAMES),
+            "second_name": rng.choice(LAST_NAMES),
+            "team": rng.randint(1, NUM_TEAMS),
+            "element_type": rng.choice(POSITIONS),
+            "now_cost": rng.randint(40, 140),
+            "selected_by_percent": f"{rng.uniform(0, 60):.1f}",
+            "total_points": rng.randint(0, 120),
+            "form": f"{rng.uniform(0, 10):.1f}",
+            "status": rng.choice(['a', 'a', 'a', 'd', 'i']),
+            "minutes": rng.randint(0, 900),
+            "goals_scored": rng.randint(0, 10),
+            "assists": rng.randint(0, 8),
+        })
+    teams = [{"id": team_id, "name": f"Team {team_id}", "short_name": f"T{team_id:02d}"} for team_id in range(1, NUM_TEAMS + 1)]
+    events = [{"id": event, "name": f"Gameweek {event}", "finished": event < 10, "is_current": event == 10} for event in range(1, NUM_EVENTS + 1)]
+    return {"events": events, "teams": teams, "elements": elements}
@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from urllib.parse import urlencode
+
+import requests
+
+from .config import FPL_API_URL, ARCHIVE_DIR, ARCHIVE_AS_OF
+from .storage import file_lock
+
+# Every upstream response body is kept, compressed on its own, in an
+# append-only responses.bin; a SQLite index maps each request (URL plus
+# parameters) and fetch time to the body's offset. Replaying a request reads
+# the newest body fetched at or before a given time, so derived files can be
+# rebuilt offline after a parser change.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    request TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_by_request ON responses (request, fetched_at);
+"""
+
+
+class NotArchived(requests.exceptions.RequestException):
+    """
+    Raised when replaying a request that was never archived, so callers
+    handle it like any other failed fetch.
+    """
+
+
+def request_key(url: str, params=None) -> str:
+    # Relative to FPL_API_URL, so an archive recorded through a proxy or mock replays anywhere.
+    # Parameters are sorted so the same request always gets the same key.
+    if url.startswith(FPL_API_URL):
+        url = url[len(FPL_API_URL):]
+    if not params:
+        return url
+    return url + ('&' if '?' in url else '?') + urlencode(sorted(params.items()))
+
+
+def _as_timestamp(value) -> float:
+    if value is None:
+        return float('inf')
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+class ResponseArchive:
+    """
+    Archive of raw upstream responses, shared by the threads of a process and
+    by any number of processes writing to the same directory.
+
+    :param directory: Directory holding responses.bin and its index.sqlite.
+    """
+    def __init__(self, directory: str = ARCHIVE_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.data_path = os.path.join(directory, 'responses.bin')
+        self.conn = sqlite3.connect(os.path.join(directory, 'index.sqlite'), timeout=60,
+                                    isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.lock = threading.Lock()
+        self.read_fd = None
+
+    def record(self, url: str, params, content: bytes, fetched_at: float = None):
+        data = zlib.compress(content, 6)
+        # The body is on disk before its index row, so the index never points past the data
+        with file_lock(self.data_path), open(self.data_path, 'ab') as file:
+            offset = file.tell()
+            file.write(data)
+        with self.lock:
+            self.conn.execute("INSERT INTO responses (request, fetched_at, offset, length, size) VALUES (?, ?, ?, ?, ?)",
+                              (request_key(url, params), fetched_at or time.time(), offset, len(data), len(content)))
+
+    def replay(self, url: str, params=None, as_of=ARCHIVE_AS_OF) -> bytes:
+        """
+        Return the body of the newest response to this request fetched at or
+        before `as_of` (an ISO timestamp or epoch seconds, default: the newest).
+        """
+        key = request_key(url, params)
+        with self.lock:
+            row = self.conn.execute("SELECT offset, length FROM responses WHERE request = ? AND fetched_at <= ? "
+                                    "ORDER BY fetched_at DESC LIMIT 1", (key, _as_timestamp(as_of))).fetchone()
+            if row is not None and self.read_fd is None:
+                self.read_fd = os.open(self.data_path, os.O_RDONLY)
+        if row is None:
+            raise NotArchived(f"No archived response for {key}")
+        offset, length = row
+        return zlib.decompress(os.pread(self.read_fd, length, offset))
+
+    def stats(self) -> dict:
+        with self.lock:
+            responses, distinct, stored, size, first, last = self.conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT request), SUM(length), SUM(size), MIN(fetched_at), MAX(fetched_at) "
+                "FROM responses").fetchone()
+        return {
+            'responses': responses,
+            'requests': distinct,
+            'stored_bytes': stored or 0,
+            'raw_bytes': size or 0,
+            'first_fetch': datetime.fromtimestamp(first).isoformat() if first else None,
+            'last_fetch': datetime.fromtimestamp(last).isoformat() if last else None,
+        }
+
+    def list_requests(self, prefix: str = ''):
+        # Distinct archived request keys starting with `prefix`
+        with self.lock:
+            rows = self.conn.execute("SELECT DISTINCT request FROM responses WHERE request >= ? AND request < ? ORDER BY request",
+                                     (prefix, prefix + '\U0010ffff')).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        self.conn.close()
+        if self.read_fd is not None:
+            os.close(self.read_fd)
+            self.read_fd = None
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> ResponseArchive:
+    # One archive per process; a forked child opens its own connection
+    global _archive
+    with _archive_lock:
+        if _archive is None or _archive[0] != os.getpid():
+            _archive = (os.getpid(), ResponseArchive())
+        return _archive[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect the archive of raw upstream responses.")
+    parser.add_argument('--dir', default=ARCHIVE_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('stats', help="Show response counts, sizes and the fetch time range")
+    listing = subparsers.add_parser('requests', help="List archived requests")
+    listing.add_argument('--prefix', default='', help="Only requests whose URL starts with this")
+    show = subparsers.add_parser('show', help="Print the archived body of a request")
+    show.add_argument('url', help="Request as listed by `requests`, e.g. /bootstrap-static/")
+    show.add_argument('--as-of', default=ARCHIVE_AS_OF, help="ISO timestamp; default the newest response")
+    args = parser.parse_args(argv)
+
+    archive = ResponseArchive(args.dir)
+    try:
+        if args.command == 'stats':
+            print(json.dumps(archive.stats()))
+        elif args.command == 'requests':
+            for request in archive.list_requests(args.prefix):
+                print(request)
+        elif args.command == 'show':
+            print(archive.replay(args.url, as_of=args.as_of).decode('utf-8'))
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from itertools import islice
+
+from .config import BULK_CONCURRENCY
+from .league import get_league_data
+
+logger = logging.getLogger(__name__)
+
+LEAGUE_TYPES = {'classic': 'leagues-classic', 'h2h': 'leagues-h2h'}
+
+
+def fetch_leagues(leagues, max_workers: int = BULK_CONCURRENCY):
+    """
+    Fetch the standings pages of several leagues concurrently.
+
+    :param leagues: (kind, league_id) pairs, kind being 'classic' or 'h2h'.
+    :return: ({(kind, league_id): pages}, {(kind, league_id): error}) in the order of `leagues`.
+    """
+    leagues = list(dict.fromkeys(leagues))
+    pages, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(get_league_data, league_id=league_id, league_type=LEAGUE_TYPES[kind]): (kind, league_id)
+                   for kind, league_id in leagues}
+        for future in as_completed(futures):
+            league = futures[future]
+            try:
+                pages[league] = future.result()
+            except Exception as e:
+                logger.error("Failed to fetch %s league %s: %s", *league, e)
+                errors[league] = str(e)
+    return {league: pages[league] for league in leagues if league in pages}, errors
+
+
+def league_members(pages) -> list:
+    # Entry ids of one league's standings pages, from both new entries and standings, in page order
+    members = []
+    for page in pages:
+        for entry in page.get('new_entries', {}).get('results', []) + page.get('standings', {}).get('results', []):
+            members.append(entry.get('entry'))
+    return list(dict.fromkeys(member for member in members if member is not None))
+
+
+def dedupe_members(pages_by_league: dict):
+    """
+    Map every entry to the leagues it belongs to.
+
+    :return: (entry_ids in first-seen order, {entry_id: [(kind, league_id), ...]})
+    """
+    memberships = {}
+    for league, pages in pages_by_league.items():
+        for entry_id in league_members(pages):
+            memberships.setdefault(entry_id, []).append(league)
+    return list(memberships), memberships
+
+
+def fetch_entries(entry_ids, fetchers: dict, max_workers: int = BULK_CONCURRENCY):
+    """
+    Run every fetcher once per entry, concurrently, and yield
+    (name, entry_id, result, error) as results come in.
+
+    At most `max_workers * 4` fetches are submitted at a time, and each result
+    is released once yielded, so memory doesn't grow with the number of entries.
+
+    :param fetchers: {name: function(entry_id)}, e.g. history, transfers, picks.
+    """
+    tasks = ((name, fetch, entry_id) for entry_id in entry_ids for name, fetch in fetchers.items())
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}
+
+        def submit(count):
+            for name, fetch, entry_id in islice(tasks, count):
+                in_flight[executor.submit(fetch, entry_id)] = (name, entry_id)
+
+        submit(max_workers * 4)
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, entry_id = in_flight.pop(future)
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    logger.error("Failed to fetch %s for entry_id: %s - %s", name, entry_id, e)
+                    result, error = None, str(e)
+                yield name, entry_id, result, error
+            submit(len(done))
@@ -0,0 +1,35 @@
+import os
+
+# Base URL of the FPL API, overridable so ingestion can be pointed at a mock or proxy
+FPL_API_URL = os.environ.get("FPL_API_URL", "https://fantasy.premierleague.com/api").rstrip("/")
+
+# Work queue shared by distributed crawl workers (see data_io/crawl.py)
+CRAWL_DB = os.environ.get("SUZE_CRAWL_DB", os.path.join("data", "crawl_queue.db"))
+# Number of hash shards entry_ids are spread over
+CRAWL_SHARDS = int(os.environ.get("SUZE_CRAWL_SHARDS", 16))
+# Entries a worker leases at a time
+CRAWL_BATCH_SIZE = int(os.environ.get("SUZE_CRAWL_BATCH_SIZE", 50))
+# Seconds a lease is held without progress before other workers may steal it
+CRAWL_LEASE_SECONDS = float(os.environ.get("SUZE_CRAWL_LEASE_SECONDS", 300))
+# Fetch attempts per entry before it is marked as failed
+CRAWL_MAX_ATTEMPTS = int(os.environ.get("SUZE_CRAWL_MAX_ATTEMPTS", 3))
+
+# Compression of JSONL data files: "none", "gzip" or "zstd" (needs the zstandard package)
+JSONL_CODEC = os.environ.get("SUZE_JSONL_CODEC", "none")
+# Uncompressed bytes per independently compressed block, the unit of random access
+JSONL_BLOCK_SIZE = int(os.environ.get("SUZE_JSONL_BLOCK_SIZE", 1 << 20))
+
+# Concurrent upstream requests made by the bulk ingestion endpoint
+BULK_CONCURRENCY = int(os.environ.get("SUZE_BULK_CONCURRENCY", 8))
+
+# Seconds an upstream response is reused for identical requests, 0 disables the cache
+FETCH_CACHE_SECONDS = float(os.environ.get("SUZE_FETCH_CACHE_SECONDS", 5))
+# Upstream responses kept in that cache at most
+FETCH_CACHE_SIZE = int(os.environ.get("SUZE_FETCH_CACHE_SIZE", 1024))
+
+# Raw upstream responses: "record" archives every response, "replay" serves
+# fetches from the archive without touching the network, "off" (default) disables both
+ARCHIVE_MODE = os.environ.get("SUZE_ARCHIVE", "off")
+ARCHIVE_DIR = os.environ.get("SUZE_ARCHIVE_DIR", os.path.join("data", "archive"))
+# Replay the responses as they were at this ISO timestamp instead of the latest ones
+ARCHIVE_AS_OF = os.environ.get("SUZE_ARCHIVE_AS_OF") or None
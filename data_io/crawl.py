@@ -0,0 +1,308 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+
+from .config import CRAWL_DB, CRAWL_SHARDS, CRAWL_BATCH_SIZE, CRAWL_LEASE_SECONDS, CRAWL_MAX_ATTEMPTS
+from .players import get_player_history, get_transfer_history
+from .jsoncodec import dumps, loads
+from .storage import file_lock, iter_jsonl_batches, JsonlWriter
+
+logger = logging.getLogger(__name__)
+
+# Per-entry crawl jobs: the fetch function and how a stored result becomes JSONL lines
+JOBS = {
+    'history': (get_player_history, lambda payload: [payload]),
+    'transfers': (get_transfer_history, lambda payload: payload),
+}
+
+# Default export target of each job, matching the files the ingestion endpoints write
+JOB_OUTPUTS = {
+    'history': os.path.join("data", "player_history.jsonl"),
+    'transfers': os.path.join("data", "transfer_history.jsonl"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    job TEXT NOT NULL,
+    entry_id INTEGER NOT NULL,
+    shard INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    PRIMARY KEY (job, entry_id)
+);
+CREATE INDEX IF NOT EXISTS tasks_by_shard ON tasks (job, shard, status, seq);
+CREATE TABLE IF NOT EXISTS results (
+    job TEXT NOT NULL,
+    entry_id INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (job, entry_id)
+);
+"""
+
+
+def shard_of(entry_id, num_shards: int) -> int:
+    # crc32 rather than hash() so every process and machine agrees on the shard
+    return zlib.crc32(str(entry_id).encode('utf-8')) % num_shards
+
+
+class CrawlQueue:
+    """
+    Durable work queue of per-entry fetches in a SQLite file.
+
+    Entries are spread over hash shards. Workers lease batches, preferring
+    their own shards, and take over other shards' pending work and any lease
+    that expired, so a slow or dead worker never holds work up. Results are
+    keyed by (job, entry_id), so fetching an entry twice only overwrites it.
+
+    :param db_path: SQLite file shared by the coordinator and all workers.
+    :param wal: Use WAL journaling; turn off when workers on other machines open the file over a network filesystem.
+    """
+    def __init__(self, db_path: str = CRAWL_DB, wal: bool = True):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=60, isolation_level=None)
+        if wal:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, so two workers can't lease the same rows
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def enqueue(self, job: str, entry_ids, num_shards: int = CRAWL_SHARDS, refresh: bool = False) -> int:
+        """
+        Add entries to a job, keeping their order for the export. Entries
+        already queued are left alone unless `refresh` puts them back to pending.
+        """
+        with self._transaction() as conn:
+            seq = conn.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM tasks WHERE job = ?", (job,)).fetchone()[0]
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO tasks (job, entry_id, shard, seq) VALUES (?, ?, ?, ?)",
+                             ((job, entry_id, shard_of(entry_id, num_shards), seq + i) for i, entry_id in enumerate(entry_ids)))
+            added = conn.total_changes - before
+            if refresh:
+                conn.execute("UPDATE tasks SET status = 'pending', owner = NULL, lease_expires = NULL, attempts = 0, error = NULL "
+                             "WHERE job = ?", (job,))
+        return added
+
+    def lease(self, job: str, owner: str, shards=None, batch_size: int = CRAWL_BATCH_SIZE,
+              lease_seconds: float = CRAWL_LEASE_SECONDS) -> list:
+        """
+        Lease up to `batch_size` entries to `owner`, from `shards` first and
+        then from anywhere else (work stealing). Returns [] once the job is drained.
+        """
+        now = time.time()
+        claimable = "job = ? AND (status = 'pending' OR (status = 'leased' AND lease_expires < ?))"
+        with self._transaction() as conn:
+            entry_ids = []
+            if shards:
+                placeholders = ",".join("?" * len(shards))
+                entry_ids = [row[0] for row in conn.execute(
+                    f"SELECT entry_id FROM tasks WHERE {claimable} AND shard IN ({placeholders}) ORDER BY seq LIMIT ?",
+                    (job, now, *shards, batch_size))]
+            if not entry_ids:
+                entry_ids = [row[0] for row in conn.execute(
+                    f"SELECT entry_id FROM tasks WHERE {claimable} ORDER BY seq LIMIT ?", (job, now, batch_size))]
+            conn.executemany("UPDATE tasks SET status = 'leased', owner = ?, lease_expires = ? WHERE job = ? AND entry_id = ?",
+                             ((owner, now + lease_seconds, job, entry_id) for entry_id in entry_ids))
+        return entry_ids
+
+    def complete(self, job: str, owner: str, entry_id, payload, lease_seconds: float = CRAWL_LEASE_SECONDS):
+        """
+        Store a fetched result and mark the entry done. Doubles as a heartbeat:
+        the rest of the owner's batch gets its lease extended.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO results (job, entry_id, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                         (job, entry_id, dumps(payload).decode('utf-8'), now))
+            conn.execute("UPDATE tasks SET status = 'done', owner = NULL, lease_expires = NULL, error = NULL "
+                         "WHERE job = ? AND entry_id = ?", (job, entry_id))
+            conn.execute("UPDATE tasks SET lease_expires = ? WHERE job = ? AND owner = ? AND status = 'leased'",
+                         (now + lease_seconds, job, owner))
+
+    def fail(self, job: str, entry_id, error: str, max_attempts: int = CRAWL_MAX_ATTEMPTS):
+        # Put the entry back for another try, or give up on it after max_attempts
+        with self._transaction() as conn:
+            conn.execute("UPDATE tasks SET attempts = attempts + 1, error = ?, owner = NULL, lease_expires = NULL, "
+                         "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END "
+                         "WHERE job = ? AND entry_id = ? AND status != 'done'",
+                         (error, max_attempts, job, entry_id))
+
+    def status(self, job: str) -> dict:
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM tasks WHERE job = ? GROUP BY status", (job,))
+        return dict(rows.fetchall())
+
+    def results(self, job: str):
+        # Done results in enqueue order
+        rows = self.conn.execute("SELECT r.payload FROM results r JOIN tasks t ON t.job = r.job AND t.entry_id = r.entry_id "
+                                 "WHERE r.job = ? ORDER BY t.seq", (job,))
+        for (payload,) in rows:
+            yield loads(payload)
+
+    def close(self):
+        self.conn.close()
+
+
+def enqueue_players(players_file: str, job: str, db_path: str = CRAWL_DB, num_shards: int = CRAWL_SHARDS,
+                    refresh: bool = False, wal: bool = True) -> int:
+    """
+    Coordinator step: queue every entry_id of `players_file` for `job`.
+    """
+    def entry_ids():
+        for batch in iter_jsonl_batches(players_file):
+            for player in batch:
+                yield player['entry_id']
+
+    queue = CrawlQueue(db_path, wal=wal)
+    try:
+        added = queue.enqueue(job, entry_ids(), num_shards=num_shards, refresh=refresh)
+    finally:
+        queue.close()
+    logger.info("Queued %s new entries for %s in %s", added, job, db_path)
+    return added
+
+
+def run_worker(job: str, db_path: str = CRAWL_DB, worker_index: int = 0, num_workers: int = 1,
+               num_shards: int = CRAWL_SHARDS, batch_size: int = CRAWL_BATCH_SIZE,
+               lease_seconds: float = CRAWL_LEASE_SECONDS, max_attempts: int = CRAWL_MAX_ATTEMPTS,
+               wal: bool = True) -> int:
+    """
+    Lease and fetch batches until the job is drained. The worker prefers the
+    shards with `shard % num_workers == worker_index` and steals from the
+    others once those are empty.
+
+    :return: Number of entries fetched by this worker.
+    """
+    fetch, _ = JOBS[job]
+    owner = f"{socket.gethostname()}:{os.getpid()}:{worker_index}"
+    shards = [shard for shard in range(num_shards) if shard % num_workers == worker_index % num_workers]
+    queue = CrawlQueue(db_path, wal=wal)
+    fetched = 0
+    try:
+        while True:
+            entry_ids = queue.lease(job, owner, shards=shards, batch_size=batch_size, lease_seconds=lease_seconds)
+            if not entry_ids:
+                break
+            for entry_id in entry_ids:
+                try:
+                    payload = fetch(entry_id)
+                except Exception as e:
+                    logger.error("Failed to fetch %s for entry_id: %s - %s", job, entry_id, e)
+                    queue.fail(job, entry_id, str(e), max_attempts=max_attempts)
+                    continue
+                queue.complete(job, owner, entry_id, payload, lease_seconds=lease_seconds)
+                fetched += 1
+    finally:
+        queue.close()
+    logger.info("Worker %s fetched %s entries for %s", owner, fetched, job)
+    return fetched
+
+
+def export_results(job: str, output_file: str = None, db_path: str = CRAWL_DB, wal: bool = True) -> int:
+    """
+    Write the job's results as JSONL in players.jsonl order, replacing
+    `output_file` atomically. Each entry appears once however often it was fetched.
+    """
+    _, to_lines = JOBS[job]
+    output_file = output_file or JOB_OUTPUTS[job]
+    queue = CrawlQueue(db_path, wal=wal)
+    written = 0
+    try:
+        # Under the file's lock, so appends from the ingestion endpoints can't land in the replaced file
+        with file_lock(output_file), JsonlWriter(output_file, 'w') as outfile:
+            for payload in queue.results(job):
+                lines = to_lines(payload)
+                outfile.write_records(lines)
+                written += len(lines)
+    finally:
+        queue.close()
+    logger.info("Exported %s lines for %s to %s", written, job, output_file)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded, resumable crawl of per-entry FPL data.")
+    parser.add_argument('--db', default=CRAWL_DB, help="Queue database shared by all workers")
+    parser.add_argument('--no-wal', action='store_true',
+                        help="Disable WAL journaling, needed when workers share the queue over a network filesystem")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = subparsers.add_parser('enqueue', help="Queue the entries of a players file")
+    enqueue.add_argument('job', choices=sorted(JOBS))
+    enqueue.add_argument('--players', default=os.path.join("data", "players.jsonl"))
+    enqueue.add_argument('--shards', type=int, default=CRAWL_SHARDS)
+    enqueue.add_argument('--refresh', action='store_true', help="Fetch entries that were already done again")
+
+    work = subparsers.add_parser('work', help="Run worker processes until the queue is drained")
+    work.add_argument('job', choices=sorted(JOBS))
+    work.add_argument('--processes', type=int, default=1, help="Worker processes on this machine")
+    work.add_argument('--worker-index', type=int, default=0, help="Index of this machine's first worker")
+    work.add_argument('--num-workers', type=int, default=None,
+                      help="Workers across all machines (default: --processes)")
+    work.add_argument('--shards', type=int, default=CRAWL_SHARDS)
+    work.add_argument('--batch-size', type=int, default=CRAWL_BATCH_SIZE)
+    work.add_argument('--lease-seconds', type=float, default=CRAWL_LEASE_SECONDS)
+    work.add_argument('--max-attempts', type=int, default=CRAWL_MAX_ATTEMPTS)
+
+    export = subparsers.add_parser('export', help="Write fetched results to JSONL")
+    export.add_argument('job', choices=sorted(JOBS))
+    export.add_argument('--output', default=None)
+
+    status = subparsers.add_parser('status', help="Show entry counts per status")
+    status.add_argument('job', choices=sorted(JOBS))
+
+    args = parser.parse_args(argv)
+    wal = not args.no_wal
+
+    if args.command == 'enqueue':
+        enqueue_players(args.players, args.job, db_path=args.db, num_shards=args.shards, refresh=args.refresh, wal=wal)
+    elif args.command == 'work':
+        num_workers = args.num_workers or args.processes
+        worker_kwargs = dict(db_path=args.db, num_workers=num_workers, num_shards=args.shards, batch_size=args.batch_size,
+                             lease_seconds=args.lease_seconds, max_attempts=args.max_attempts, wal=wal)
+        if args.processes == 1:
+            run_worker(args.job, worker_index=args.worker_index, **worker_kwargs)
+        else:
+            context = multiprocessing.get_context("spawn")
+            workers = [context.Process(target=run_worker, args=(args.job,),
+                                       kwargs=dict(worker_kwargs, worker_index=args.worker_index + i))
+                       for i in range(args.processes)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+    elif args.command == 'export':
+        export_results(args.job, output_file=args.output, db_path=args.db, wal=wal)
+
+    queue = CrawlQueue(args.db, wal=wal)
+    try:
+        print(json.dumps({args.job: queue.status(args.job)}))
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    from logging_config import configure_logging
+    configure_logging()
+    main()
@@ -0,0 +1,79 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# JSON encoding and decoding for the data files and API bodies. orjson is used
+# when it is installed (`pip install orjson`), the standard library otherwise;
+# both write compact UTF-8 without spaces after separators. What orjson can't
+# handle falls back to the standard library: integers beyond 64 bits on
+# encode, NaN and Infinity written by older versions on decode.
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def _stdlib_dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def dumps(obj) -> bytes:
+    """
+    Encode `obj` as compact UTF-8 JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return _stdlib_dumps(obj)
+
+
+def dump_lines(records) -> bytes:
+    """
+    Encode records as JSONL, one newline-terminated line per record.
+    """
+    if orjson is not None:
+        lines = []
+        for record in records:
+            try:
+                lines.append(orjson.dumps(record, option=_ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE))
+            except TypeError:
+                lines.append(_stdlib_dumps(record) + b'\n')
+        return b''.join(lines)
+    return b''.join(_stdlib_dumps(record) + b'\n' for record in records)
+
+
+def loads(data):
+    """
+    Decode one JSON document from str or bytes.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def load_lines(data) -> list:
+    """
+    Decode a block of JSONL (str or bytes) into a list of records, skipping
+    blank lines. The block is parsed as a single JSON array where possible,
+    which saves a parser call per line.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    lines = [line for line in data.split(b'\n') if line.strip()]
+    if not lines:
+        return []
+    try:
+        records = loads(b'[' + b','.join(lines) + b']')
+        # Damaged lines can pair up into one valid value, e.g. "[1" and "2]"
+        if len(records) == len(lines):
+            return records
+    except ValueError:
+        pass
+    # Pinpoint the bad line, or parse lines the array form can't hold
+    return [loads(line) for line in lines]
@@ -1,3 +1,4 @@
+from .config import FPL_API_URL
 from .utils import fetch_data
 
 LEAGUE_FIELDNAMES = ['id', 'name', 'created', 'closed', 'max_entries', 'league_type', 
@@ -13,7 +14,7 @@ STANDINGS_FIELDNAMES = ['id', 'division', 'entry', 'player_name', 'rank',
 
 
 def get_league_data(league_id: str, league_type='leagues-classic'):
-    base_url = f"https://fantasy.premierleague.com/api/{league_type}/{league_id}/standings/"
+    base_url = f"{FPL_API_URL}/{league_type}/{league_id}/standings/"
 
     params = {
         "page_standings": 1,
@@ -47,7 +48,7 @@ def get_league_data(league_id: str, league_type='leagues-classic'):
 
 
 def get_h2h_matches(league_id: str):
-    base_url = f"https://fantasy.premierleague.com/api/leagues-h2h-matches/league/{league_id}/"
+    base_url = f"{FPL_API_URL}/leagues-h2h-matches/league/{league_id}/"
     params = {
         "page": 1,
         # Add more parameters if needed
@@ -70,5 +71,5 @@ def get_h2h_matches(league_id: str):
 
 
 def get_fpl_master_data():
-    url = "https://fantasy.premierleague.com/api/bootstrap-static/"
+    url = f"{FPL_API_URL}/bootstrap-static/"
     return fetch_data(url)
\ No newline at end of file
@@ -1,6 +1,11 @@
+import logging
+
 import requests
+from .config import FPL_API_URL
 from .utils import fetch_data
 
+logger = logging.getLogger(__name__)
+
 
 def extract_player_data(data):
     # Extract the new entries
@@ -42,7 +47,7 @@ def extract_player_data(data):
 
 def get_player_history(entry_id: str):
     # Base URL for sending requests
-    base_url = "https://fantasy.premierleague.com/api/entry/{team_id}/history/"
+    base_url = FPL_API_URL + "/entry/{team_id}/history/"
     # Construct the URL with the entry_id
     url = base_url.format(team_id=entry_id)
     
@@ -50,37 +55,37 @@ def get_player_history(entry_id: str):
         # Send the request to the API
         result = fetch_data(url)
         result['entry_id'] = entry_id
-        print(f"Successfully processed entry_id: {entry_id}")
+        logger.info("Successfully processed entry_id: %s", entry_id)
     except requests.exceptions.RequestException as e:
-        print(f"Failed to process entry_id: {entry_id} - {e}")
+        logger.error("Failed to process entry_id: %s - %s", entry_id, e)
     
     return result
 
 def get_transfer_history(entry_id: str):
     # Base URL for sending requests
-    base_url = "https://fantasy.premierleague.com/api/entry/{team_id}/transfers/"
+    base_url = FPL_API_URL + "/entry/{team_id}/transfers/"
     # Construct the URL with the entry_id
     url = base_url.format(team_id=entry_id)
     
     try:
         # Send the request to the API
         result = fetch_data(url)
-        print(f"Successfully fetched transfers for entry_id: {entry_id}")
+        logger.info("Successfully fetched transfers for entry_id: %s", entry_id)
     except requests.exceptions.RequestException as e:
-        print(f"Failed to fetch transfers for entry_id: {entry_id} - {e}")
+        logger.error("Failed to fetch transfers for entry_id: %s - %s", entry_id, e)
     
     return result
 
 def get_picks_history(gw_number: str, entry_id: str):
     # Base URL for sending requests
-    url = f"https://fantasy.premierleague.com/api/entry/{entry_id}/event/{gw_number}/picks/"
+    url = f"{FPL_API_URL}/entry/{entry_id}/event/{gw_number}/picks/"
     
     try:
         # Send the request to the API
         result = fetch_data(url)
         result['entry_id'] = entry_id
-        print(f"Successfully fetched picks for entry_id: {entry_id}")
+        logger.info("Successfully fetched picks for entry_id: %s", entry_id)
     except requests.exceptions.RequestException as e:
-        print(f"Failed to fetch picks for entry_id: {entry_id} - {e}")
+        logger.error("Failed to fetch picks for entry_id: %s - %s", entry_id, e)
     
     return result
@@ -0,0 +1,81 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first caller
+    runs the function, callers arriving while it runs wait and share its
+    result or exception. Nothing is kept once the call finishes.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+        if leader:
+            try:
+                call['result'] = fn()
+            except BaseException as e:
+                call['error'] = e
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                call['done'].set()
+        else:
+            call['done'].wait()
+        if call['error'] is not None:
+            raise call['error']
+        return call['result']
+
+
+class TTLCache:
+    """
+    Small thread-safe cache whose entries expire `ttl` seconds after they are
+    stored; the oldest entries are dropped beyond `max_size`.
+    """
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self.entries[key]
+                return None
+            return entry[1]
+
+    def put(self, key, value):
+        if self.ttl <= 0:
+            return
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+
+def coalesced(flight: SingleFlight):
+    """
+    Decorator running concurrent calls with equal arguments once, e.g. two
+    clients triggering the same ingestion endpoint at the same time.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (fn, repr(args), repr(sorted(kwargs.items())))
+            return flight.do(key, lambda: fn(*args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,213 @@
+import argparse
+import csv
+import logging
+import os
+import threading
+from array import array
+from datetime import datetime
+
+from .storage import file_lock
+
+logger = logging.getLogger(__name__)
+
+# One append-only file of fixed-width values per column; row i is the i-th value of every column.
+# Missing values are stored as -1.
+COLUMNS = {
+    'entry': 'q',
+    'league': 'q',
+    'timestamp': 'd',
+    'event': 'i',
+    'rank': 'i',
+    'total': 'i',
+    'points_for': 'i',
+}
+
+MISSING = -1
+
+STANDINGS_STORE_DIR = os.path.join("data", "standings_h2h")
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def _int(value) -> int:
+    return MISSING if value in (None, '') else int(value)
+
+
+class StandingsStore:
+    """
+    Time series of H2H standings: (entry, league, timestamp, event) -> rank,
+    total, points_for, stored as compact array-backed columns.
+
+    `event` is the number of matches played, which is the gameweek for
+    leagues that started in gameweek 1. Rows are indexed in memory by league
+    and entry, and the index picks up rows appended by other processes on the
+    next query.
+
+    :param directory: Directory holding one `<column>.bin` file per column.
+    """
+    def __init__(self, directory: str = STANDINGS_STORE_DIR):
+        self.directory = directory
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        self.by_league = {}
+        self.leagues_of_entry = {}
+        self.lock = threading.Lock()
+
+    def _path(self, column: str) -> str:
+        return os.path.join(self.directory, column + '.bin')
+
+    def _stored_rows(self) -> int:
+        # A crash between column appends leaves some columns longer; only complete rows count
+        sizes = []
+        for name, typecode in COLUMNS.items():
+            path = self._path(name)
+            sizes.append(os.path.getsize(path) // array(typecode).itemsize if os.path.exists(path) else 0)
+        return min(sizes)
+
+    def append(self, rows):
+        """
+        Append standings rows, dicts with entry, league_id, timestamp, event,
+        rank, total and points_for.
+        """
+        new = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        for row in rows:
+            new['entry'].append(int(row['entry']))
+            new['league'].append(int(row['league_id']))
+            new['timestamp'].append(_timestamp(row['timestamp']))
+            new['event'].append(_int(row.get('event')))
+            new['rank'].append(_int(row.get('rank')))
+            new['total'].append(_int(row.get('total')))
+            new['points_for'].append(_int(row.get('points_for')))
+        if not new['entry']:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        with file_lock(os.path.join(self.directory, 'columns')):
+            num_rows = self._stored_rows()
+            for name, values in new.items():
+                with open(self._path(name), 'ab') as file:
+                    # Drop any partial row first so all columns stay aligned
+                    file.truncate(num_rows * values.itemsize)
+                    values.tofile(file)
+
+    def refresh(self):
+        # Load rows appended since the last call and add them to the index
+        with self.lock:
+            start = len(self.columns['entry'])
+            num_rows = self._stored_rows()
+            if num_rows <= start:
+                return
+            for name, values in self.columns.items():
+                with open(self._path(name), 'rb') as file:
+                    file.seek(start * values.itemsize)
+                    values.fromfile(file, num_rows - start)
+            entries, leagues = self.columns['entry'], self.columns['league']
+            for row in range(start, num_rows):
+                entry, league = entries[row], leagues[row]
+                league_rows = self.by_league.setdefault(league, {})
+                if entry not in league_rows:
+                    league_rows[entry] = []
+                    self.leagues_of_entry.setdefault(entry, []).append(league)
+                league_rows[entry].append(row)
+
+    def _point(self, row: int) -> dict:
+        point = {name: values[row] for name, values in self.columns.items()}
+        point['league_id'] = point.pop('league')
+        point['timestamp'] = datetime.fromtimestamp(point['timestamp']).isoformat()
+        return {name: (None if value == MISSING else value) for name, value in point.items()}
+
+    @staticmethod
+    def _last_per_event(rows, events) -> list:
+        # Rows are in append order, so the last row of each event is its latest snapshot
+        latest = {}
+        for row in rows:
+            latest[events[row]] = row
+        return [latest[event] for event in sorted(latest)]
+
+    def trajectory(self, entry_id: int, league_id: int = None) -> list:
+        """
+        Rank history of an entry, one point per league and event (its latest
+        snapshot), ordered by league and event.
+        """
+        self.refresh()
+        # Under the lock, as another thread's refresh may be extending the index
+        with self.lock:
+            events = self.columns['event']
+            leagues = [league_id] if league_id is not None else self.leagues_of_entry.get(entry_id, [])
+            points = []
+            for league in leagues:
+                rows = self.by_league.get(league, {}).get(entry_id, [])
+                points.extend(self._point(row) for row in self._last_per_event(rows, events))
+        return points
+
+    def movers(self, league_id: int, limit: int = 10) -> dict:
+        """
+        Entries of a league with the biggest rank changes between their latest
+        snapshot and their latest snapshot of an earlier event.
+        """
+        self.refresh()
+
+        def describe(change):
+            delta, entry, previous, latest = change
+            point = self._point(latest)
+            point.update(previous_event=events[previous], previous_rank=ranks[previous], rank_change=delta)
+            return point
+
+        # Under the lock, as another thread's refresh may be extending the index
+        with self.lock:
+            events, ranks = self.columns['event'], self.columns['rank']
+            changes = []
+            for entry, rows in self.by_league.get(league_id, {}).items():
+                latest = rows[-1]
+                # Walk back to the newest row of an earlier event
+                for row in reversed(rows):
+                    if events[row] < events[latest]:
+                        break
+                else:
+                    continue
+                if ranks[row] == MISSING or ranks[latest] == MISSING:
+                    continue
+                changes.append((ranks[row] - ranks[latest], entry, row, latest))
+
+            changes.sort(key=lambda change: (-change[0], change[1]))
+            risers = [describe(change) for change in changes[:limit] if change[0] > 0]
+            fallers = [describe(change) for change in reversed(changes[-limit:]) if change[0] < 0]
+        return {'league_id': league_id, 'risers': risers, 'fallers': fallers}
+
+    def __len__(self):
+        self.refresh()
+        with self.lock:
+            return len(self.columns['entry'])
+
+
+def import_standings_csv(csv_file: str, store: StandingsStore, batch_size: int = 100000) -> int:
+    """
+    Backfill the store from a standings_h2h.csv written by earlier versions.
+    """
+    imported = 0
+    batch = []
+    with open(csv_file, 'r', newline='', encoding='utf-8') as csvfile:
+        for row in csv.DictReader(csvfile):
+            batch.append(dict(row, timestamp=row['timestamp_requested'], event=row['matches_played']))
+            if len(batch) >= batch_size:
+                store.append(batch)
+                imported += len(batch)
+                batch = []
+    store.append(batch)
+    return imported + len(batch)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill the H2H rank-history store from standings_h2h.csv.")
+    parser.add_argument('csv_file', nargs='?', default=os.path.join("data", "standings_h2h.csv"))
+    parser.add_argument('--store', default=STANDINGS_STORE_DIR)
+    args = parser.parse_args(argv)
+    imported = import_standings_csv(args.csv_file, StandingsStore(args.store))
+    print(f"Imported {imported} rows into {args.store}")
+
+
+if __name__ == "__main__":
+    main()
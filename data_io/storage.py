@@ -0,0 +1,456 @@
+import argparse
+import gzip
+import io
+import os
+import stat
+import tempfile
+import zlib
+from contextlib import contextmanager, ExitStack
+
+from .config import JSONL_CODEC, JSONL_BLOCK_SIZE
+from .jsoncodec import dump_lines, load_lines
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Writers across threads, uvicorn workers and processes coordinate through
+# advisory locks on a "<path>.lock" sidecar, so data files themselves are
+# never locked and readers are never blocked.
+
+# Read once at import: os.umask can only be read by setting it, which races with other threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Hold an exclusive advisory lock for `path` for the duration of the block.
+    Use it around read-modify-write sequences that span several files, e.g. a
+    JSONL append plus the state file tracking how much of it was processed.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path + '.lock', 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', **open_kwargs):
+    """
+    Write a whole file through a temporary file in the same directory that
+    replaces `path` on success, so readers never see a half-written file.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates the file as 0600; keep the replaced file's mode, or the usual one for a new file
+        try:
+            file_mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            file_mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, file_mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+# JSONL files can be stored compressed. Each block of about JSONL_BLOCK_SIZE
+# bytes is compressed on its own (a gzip member or a zstd frame), so the file is
+# still a valid .gz/.zst stream for streaming readers and for command line tools,
+# appends just add blocks, and a "<file>.idx" sidecar of block offsets lets
+# readers seek to a line without decompressing what comes before it. Callers use
+# the logical path ("data/player_history.jsonl"); the codec's extension is added here.
+
+JSONL_EXTENSIONS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+
+# Buffer size of plain JSONL files and of the bulk readers
+IO_BUFFER_SIZE = 1 << 20
+
+
+class _GzipCodec:
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=6, mtime=0)
+
+    def decompress(self, data: bytes) -> bytes:
+        return gzip.decompress(data)
+
+    def decompressor(self):
+        return zlib.decompressobj(wbits=31)
+
+    def open_stream(self, path: str):
+        return gzip.open(path, 'rb')
+
+
+class _ZstdCodec:
+    def __init__(self):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("SUZE_JSONL_CODEC=zstd needs the zstandard package: pip install zstandard")
+        self.zstandard = zstandard
+        self.compressor = zstandard.ZstdCompressor(level=3)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self.zstandard.ZstdDecompressor().decompress(data)
+
+    def decompressor(self):
+        return self.zstandard.ZstdDecompressor().decompressobj()
+
+    def open_stream(self, path: str):
+        return self.zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True, closefd=True)
+
+
+_CODECS = {}
+
+
+def _codec(name: str):
+    if name not in JSONL_EXTENSIONS or name == 'none':
+        raise ValueError(f"Unknown JSONL codec: {name}")
+    if name not in _CODECS:
+        _CODECS[name] = _GzipCodec() if name == 'gzip' else _ZstdCodec()
+    return _CODECS[name]
+
+
+def find_jsonl(path: str, codec: str = None):
+    """
+    Return (physical path, codec) of the stored variant of a logical JSONL path,
+    preferring the configured codec. Files written under another codec stay
+    readable. If none exists, the configured codec's path is returned.
+    """
+    codec = codec or JSONL_CODEC
+    for name in [codec] + [name for name in JSONL_EXTENSIONS if name != codec]:
+        if os.path.exists(path + JSONL_EXTENSIONS[name]):
+            return path + JSONL_EXTENSIONS[name], name
+    return path + JSONL_EXTENSIONS[codec], codec
+
+
+def jsonl_exists(path: str) -> bool:
+    return any(os.path.exists(path + extension) for extension in JSONL_EXTENSIONS.values())
+
+
+def open_jsonl(path: str):
+    """
+    Open a logical JSONL path for streaming reads as text, decompressing on the fly.
+    """
+    physical, codec = find_jsonl(path)
+    if codec == 'none':
+        return open(physical, 'r', encoding='utf-8')
+    return io.TextIOWrapper(_codec(codec).open_stream(physical), encoding='utf-8')
+
+
+def _scan_blocks(physical: str, codec) -> list:
+    # Rebuild the block index by decompressing the file once, block by block
+    blocks = []
+    start = position = lines = 0
+    decompressor = codec.decompressor()
+    with open(physical, 'rb') as file:
+        data = b''
+        while True:
+            data = data or file.read(1 << 20)
+            if not data:
+                break
+            lines += decompressor.decompress(data).count(b'\n')
+            if decompressor.eof:
+                position += len(data) - len(decompressor.unused_data)
+                blocks.append((start, position - start, lines))
+                start, lines = position, 0
+                data = decompressor.unused_data
+                decompressor = codec.decompressor()
+            else:
+                position += len(data)
+                data = b''
+    return blocks
+
+
+def _load_index(physical: str, codec) -> list:
+    # Blocks as (offset, length, lines); the sidecar is only trusted if it covers the whole file
+    index_path = physical + '.idx'
+    if os.path.exists(index_path):
+        with open(index_path, 'r') as index_file:
+            blocks = [tuple(int(value) for value in line.split()) for line in index_file if line.strip()]
+        end = 0
+        for block in blocks:
+            # Also stops at an entry a crash cut short
+            if len(block) != 3 or block[0] != end:
+                break
+            end = block[0] + block[1]
+        else:
+            if end == os.path.getsize(physical):
+                return blocks
+    return _scan_blocks(physical, codec)
+
+
+def _index_is_current(physical: str) -> bool:
+    # Appends only ever extend both files, so the index is current if its last entry ends where the data ends
+    try:
+        with open(physical + '.idx', 'rb') as index_file:
+            index_file.seek(0, os.SEEK_END)
+            index_file.seek(max(0, index_file.tell() - 4096))
+            tail = index_file.read()
+    except FileNotFoundError:
+        return False
+    data_size = os.path.getsize(physical)
+    if not tail.strip():
+        return data_size == 0
+    if not tail.endswith(b'\n'):
+        # A crash cut the last entry short
+        return False
+    last = tail.splitlines()[-1].split()
+    return len(last) == 3 and int(last[0]) + int(last[1]) == data_size
+
+
+def iter_jsonl_lines(path: str, start: int = 0):
+    """
+    Yield (line_number, line) of a logical JSONL path from line `start` on.
+    Compressed files skip whole blocks through the index instead of reading them.
+    """
+    physical, codec = find_jsonl(path)
+    if codec == 'none' or start == 0:
+        with open_jsonl(path) as file:
+            for line_number, line in enumerate(file):
+                if line_number >= start:
+                    yield line_number, line
+        return
+
+    codec = _codec(codec)
+    line_number = 0
+    with open(physical, 'rb') as file:
+        for offset, length, lines in _load_index(physical, codec):
+            if line_number + lines <= start:
+                line_number += lines
+                continue
+            file.seek(offset)
+            # Split on b'\n' only: str.splitlines also breaks on U+2028, U+0085 and other
+            # characters that JSON strings may hold unescaped
+            lines = codec.decompress(file.read(length)).split(b'\n')
+            last = lines.pop()
+            for line in lines:
+                if line_number >= start:
+                    yield line_number, line.decode('utf-8') + '\n'
+                line_number += 1
+            if last:
+                # A final line without its newline
+                if line_number >= start:
+                    yield line_number, last.decode('utf-8')
+                line_number += 1
+
+
+def _open_binary(path: str):
+    physical, codec = find_jsonl(path)
+    if codec == 'none':
+        return open(physical, 'rb', buffering=IO_BUFFER_SIZE)
+    return _codec(codec).open_stream(physical)
+
+
+def iter_jsonl_batches(path: str, batch_bytes: int = IO_BUFFER_SIZE):
+    """
+    Yield the records of a logical JSONL path as lists, parsing about
+    `batch_bytes` of lines at a time in bulk instead of line by line.
+    """
+    with _open_binary(path) as file:
+        rest = b''
+        while True:
+            chunk = file.read(batch_bytes)
+            if not chunk:
+                break
+            data = rest + chunk
+            end = data.rfind(b'\n') + 1
+            rest = data[end:]
+            if end:
+                yield load_lines(data[:end])
+        if rest.strip():
+            yield load_lines(rest)
+
+
+def read_jsonl_records(path: str) -> list:
+    # All records of a logical JSONL path
+    records = []
+    for batch in iter_jsonl_batches(path):
+        records.extend(batch)
+    return records
+
+
+class JsonlWriter:
+    """
+    Writes lines to a logical JSONL path through a large buffer, compressed in
+    independent blocks when a codec is configured. Callers must write whole lines.
+
+    :param path: Logical path, without the codec's extension.
+    :param mode: 'a' appends to whichever variant of the file exists; 'w' atomically replaces the file.
+    :param codec: Overrides SUZE_JSONL_CODEC for new files.
+    :param block_size: Uncompressed bytes per compressed block.
+    """
+    def __init__(self, path: str, mode: str = 'a', codec: str = None, block_size: int = JSONL_BLOCK_SIZE):
+        if mode == 'a':
+            self.physical, self.codec_name = find_jsonl(path, codec)
+        else:
+            self.codec_name = codec or JSONL_CODEC
+            self.physical = path + JSONL_EXTENSIONS[self.codec_name]
+        self.path = path
+        self.mode = mode
+        self.block_size = block_size
+        self.codec = None if self.codec_name == 'none' else _codec(self.codec_name)
+        self.buffer = []
+        self.buffered = 0
+
+        directory = os.path.dirname(self.physical)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._stack = ExitStack()
+        if self.codec is None:
+            self.file = self._stack.enter_context(atomic_write(self.physical, 'wb', buffering=IO_BUFFER_SIZE) if mode == 'w'
+                                                  else open(self.physical, 'ab', buffering=IO_BUFFER_SIZE))
+            return
+        if mode == 'w':
+            self.index_file = self._stack.enter_context(atomic_write(self.physical + '.idx'))
+            self.file = self._stack.enter_context(atomic_write(self.physical, 'wb'))
+        else:
+            if os.path.exists(self.physical) and not _index_is_current(self.physical):
+                # Appends extend the index, so repair it first if a crash left it behind the data
+                blocks = _load_index(self.physical, self.codec)
+                with atomic_write(self.physical + '.idx') as index_file:
+                    index_file.writelines(f"{offset} {length} {lines}\n" for offset, length, lines in blocks)
+            self.index_file = self._stack.enter_context(open(self.physical + '.idx', 'a'))
+            self.file = self._stack.enter_context(open(self.physical, 'ab'))
+        self.offset = self.file.tell()
+
+    def write(self, data):
+        # Whole lines as str or as UTF-8 bytes
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if self.codec is None:
+            self.file.write(data)
+            return
+        self.buffer.append(data)
+        self.buffered += len(data)
+        if self.buffered >= self.block_size:
+            self._write_block()
+
+    def write_records(self, records):
+        # Encode records as JSONL lines in one go
+        self.write(dump_lines(records))
+
+    def _write_block(self):
+        if not self.buffer:
+            return
+        data = b''.join(self.buffer)
+        lines = data.count(b'\n')
+        block = self.codec.compress(data)
+        self.file.write(block)
+        self.index_file.write(f"{self.offset} {len(block)} {lines}\n")
+        self.offset += len(block)
+        self.buffer = []
+        self.buffered = 0
+
+    def close(self):
+        if self.codec is not None:
+            self._write_block()
+        # Closes (and for 'w' renames into place) the data file before its index
+        self._stack.close()
+        if self.mode == 'w':
+            # Variants under other codecs are stale now
+            for extension in JSONL_EXTENSIONS.values():
+                stale = self.path + extension
+                if stale != self.physical:
+                    for file_path in (stale, stale + '.idx'):
+                        if os.path.exists(file_path):
+                            os.remove(file_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None and self.mode == 'w':
+            # Leave the old file in place
+            self._stack.__exit__(exc_type, exc_value, traceback)
+            return
+        self.close()
+
+
+class LockedAppender:
+    """
+    Appends lines to a shared JSONL file in batches. Each batch is written and
+    flushed while holding the file's lock, so lines from concurrent writers
+    never interleave mid-line.
+
+    :param path: Logical JSONL path to append to.
+    :param batch_size: Lines that also trigger a write when set, whichever limit comes first.
+    :param batch_bytes: Buffered bytes written out at once; the block size by default, so each
+        flush of a compressed file adds one full block rather than a small one.
+    """
+    def __init__(self, path: str, batch_size: int = None, batch_bytes: int = JSONL_BLOCK_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.buffer = []
+        self.lines = 0
+        self.buffered = 0
+
+    def write(self, data):
+        # Whole lines as str or as UTF-8 bytes
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.buffer.append(data)
+        self.lines += data.count(b'\n')
+        self.buffered += len(data)
+        if self.buffered >= self.batch_bytes or (self.batch_size is not None and self.lines >= self.batch_size):
+            self.flush()
+
+    def write_records(self, records):
+        self.write(dump_lines(records))
+
+    def flush(self):
+        if not self.buffer:
+            return
+        with file_lock(self.path), JsonlWriter(self.path) as file:
+            file.write(b''.join(self.buffer))
+        self.buffer = []
+        self.lines = 0
+        self.buffered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+
+def convert_jsonl(path: str, codec: str):
+    """
+    Rewrite a logical JSONL path under another codec, e.g. to compress existing data.
+    """
+    with file_lock(path), open_jsonl(path) as infile, JsonlWriter(path, 'w', codec=codec) as outfile:
+        for line in infile:
+            outfile.write(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert JSONL data files between storage codecs.")
+    parser.add_argument('paths', nargs='+', help="Logical paths, e.g. data/player_history.jsonl")
+    parser.add_argument('--codec', default=JSONL_CODEC, choices=sorted(JSONL_EXTENSIONS))
+    args = parser.parse_args(argv)
+    for path in args.paths:
+        convert_jsonl(path, args.codec)
+        print(f"{path}: {find_jsonl(path, args.codec)[0]}")
+
+
+if __name__ == "__main__":
+    main()
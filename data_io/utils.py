@@ -1,6 +1,40 @@
+import logging
+
 import requests
 
-def fetch_data(url, params=None):
+from .archive import get_archive
+from .config import ARCHIVE_MODE, FETCH_CACHE_SECONDS, FETCH_CACHE_SIZE
+from .jsoncodec import loads
+from .singleflight import SingleFlight, TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Identical upstream requests in flight at the same time share one response, and
+# responses are reused for a few seconds so bursts of polling cost one call.
+# Raw bodies are shared and parsed per caller, since callers modify the result.
+_fetches = SingleFlight()
+_responses = TTLCache(FETCH_CACHE_SECONDS, FETCH_CACHE_SIZE)
+
+
+def _get(url, params):
+    # Replay serves every fetch from the raw-response archive, offline
+    if ARCHIVE_MODE == 'replay':
+        return get_archive().replay(url, params)
     response = requests.get(url, params=params)
     response.raise_for_status()  # Raise an exception for HTTP errors
-    return response.json()
+    if ARCHIVE_MODE == 'record':
+        # The fetch succeeded, so a full disk or a locked index only costs the archived copy
+        try:
+            get_archive().record(url, params, response.content)
+        except Exception as e:
+            logger.error("Failed to archive response of %s: %s", url, e)
+    return response.content
+
+
+def fetch_data(url, params=None):
+    key = (url, tuple(sorted((params or {}).items())))
+    content = _responses.get(key)
+    if content is None:
+        content = _fetches.do(key, lambda: _get(url, params))
+        _responses.put(key, content)
+    return loads(content)
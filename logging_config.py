@@ -0,0 +1,177 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else on a record came in through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Render each record as one JSON object per line, including any `extra=` fields.
+    """
+    def format(self, record):
+        payload = {
+            'timestamp': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exception'] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    The classic app.log line format, noting records dropped by RateLimitFilter.
+    """
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record):
+        text = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        return f"{text} ({suppressed} similar messages suppressed)" if suppressed else text
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per message template, so per-entry messages such as
+    "Successfully processed entry_id: %s" cannot flood the log while one-off
+    messages always get through. The next record that passes after a burst
+    reports how many similar records were dropped.
+
+    :param rate: Records per second allowed for each template once the burst is spent.
+    :param burst: Records allowed back to back for each template.
+    """
+    def __init__(self, rate: float = 1.0, burst: int = 20):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        # Warnings and errors are never dropped
+        if record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated, suppressed = self.buckets.get(key, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self.buckets[key] = (tokens, now, suppressed + 1)
+                return False
+            self.buckets[key] = (tokens - 1, now, 0)
+
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that formats only the message text in the calling thread,
+    leaving timestamps, formatting and file I/O to the listener thread, and
+    drops records instead of blocking when the queue is full. Dropped records
+    are reported with a warning once the queue has room again, and at shutdown.
+    """
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+        self.unreported = 0
+        # Separate from Handler.lock, which is already held around enqueue
+        self.count_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Arguments can change once the caller moves on, so the message is merged here.
+        # Tracebacks reference live frames, so they are rendered before leaving the calling thread too.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.unreported:
+            self.report_dropped()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.count_lock:
+                self.dropped += 1
+                self.unreported += 1
+
+    def report_dropped(self, timeout: float = None):
+        # Queue a warning with the number of records dropped since the last report
+        with self.count_lock:
+            count, self.unreported = self.unreported, 0
+        if not count:
+            return
+        record = self.prepare(logging.LogRecord(__name__, logging.WARNING, __file__, 0,
+                                                "%s log records dropped, the log queue was full", (count,), None))
+        try:
+            if timeout is None:
+                self.queue.put_nowait(record)
+            else:
+                self.queue.put(record, timeout=timeout)
+        except queue.Full:
+            with self.count_lock:
+                self.unreported += count
+
+
+def configure_logging(filename: str = None, level: str = None, json_format: bool = None, queue_size: int = 10000):
+    """
+    Route all logging through a bounded queue to a background writer.
+
+    Settings default to the SUZE_LOG_FILE, SUZE_LOG_LEVEL and SUZE_LOG_FORMAT
+    (`text` or `json`) environment variables. Calling it again is a no-op.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    filename = filename or os.environ.get('SUZE_LOG_FILE', 'app.log')
+    level = level or os.environ.get('SUZE_LOG_LEVEL', 'INFO')
+    if json_format is None:
+        json_format = os.environ.get('SUZE_LOG_FORMAT', 'text').lower() == 'json'
+
+    file_handler = logging.FileHandler(filename)
+    file_handler.setFormatter(JsonFormatter() if json_format else TextFormatter())
+
+    queue_handler = DeferredQueueHandler(queue.Queue(maxsize=queue_size))
+    queue_handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(queue_handler.queue, file_handler, respect_handler_level=True)
+    _listener.start()
+
+    def shutdown():
+        queue_handler.report_dropped(timeout=1)
+        _listener.stop()
+
+    atexit.register(shutdown)
+    return _listener
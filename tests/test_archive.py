@@ -0,0 +1,39 @@
+import pytest
+
+from data_io.archive import NotArchived, ResponseArchive, request_key
+from data_io.config import FPL_API_URL
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = ResponseArchive(str(tmp_path / 'archive'))
+    yield archive
+    archive.close()
+
+
+def test_replay_as_of(archive):
+    url = FPL_API_URL + '/leagues-classic/314/standings/'
+    archive.record(url, {'page_standings': 2, 'page_new_entries': 2}, b'{"rank": 2}', fetched_at=1000.0)
+    archive.record(url, {'page_new_entries': 2, 'page_standings': 2}, b'{"rank": 1}', fetched_at=2000.0)
+    archive.record(url, {'page_standings': 3}, b'{"rank": 9}', fetched_at=1500.0)
+
+    # Parameter order doesn't matter, and the newest response wins by default
+    assert archive.replay(url, {'page_standings': 2, 'page_new_entries': 2}) == b'{"rank": 1}'
+    assert archive.replay(url, {'page_standings': 2, 'page_new_entries': 2}, as_of=1999.0) == b'{"rank": 2}'
+    assert archive.replay(url, {'page_standings': 2, 'page_new_entries': 2}, as_of='1970-01-01T00:33:20+00:00') == b'{"rank": 1}'
+    with pytest.raises(NotArchived):
+        archive.replay(url, {'page_standings': 2, 'page_new_entries': 2}, as_of=999.0)
+    with pytest.raises(NotArchived):
+        archive.replay(url, {'page_standings': 4})
+
+    assert archive.list_requests('/leagues-classic/') == [
+        '/leagues-classic/314/standings/?page_new_entries=2&page_standings=2',
+        '/leagues-classic/314/standings/?page_standings=3',
+    ]
+    stats = archive.stats()
+    assert stats['responses'] == 3 and stats['requests'] == 2 and stats['raw_bytes'] == 33
+
+
+def test_keys_are_relative_to_api_url():
+    assert request_key(FPL_API_URL + '/bootstrap-static/') == '/bootstrap-static/'
+    assert request_key('http://mock/api/entry/1/history/?x=1', {'b': 2, 'a': 1}) == 'http://mock/api/entry/1/history/?x=1&a=1&b=2'
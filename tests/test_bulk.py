@@ -0,0 +1,33 @@
+import threading
+import time
+
+from data_io.bulk import fetch_entries
+
+
+def test_fetch_entries_bounds_in_flight_fetches():
+    lock = threading.Lock()
+    started = []
+    finished = []
+
+    def fetch(entry_id):
+        with lock:
+            started.append(entry_id)
+        time.sleep(0.001)
+        if entry_id % 10 == 0:
+            raise ValueError("not found")
+        return {'entry': entry_id}
+
+    peak = 0
+    results = []
+    for name, entry_id, result, error in fetch_entries(range(200), {'history': fetch}, max_workers=2):
+        if not finished:
+            # A slow consumer must not let fetching run ahead
+            time.sleep(0.2)
+        finished.append(entry_id)
+        # Fetches submitted but not yet yielded stay within the window
+        peak = max(peak, len(started) - len(finished))
+        results.append((entry_id, result, error))
+
+    assert peak <= 8
+    assert sorted(entry_id for entry_id, _, _ in results) == list(range(200))
+    assert all((error is not None) == (entry_id % 10 == 0) for entry_id, _, error in results)
@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+
+import pytest
+
+from data_io import crawl, storage
+from data_io.crawl import CrawlQueue, export_results, shard_of
+from data_io.storage import read_jsonl_records
+
+
+@pytest.fixture
+def crawl_queue(tmp_path):
+    crawl_queue = CrawlQueue(str(tmp_path / 'crawl_queue.db'))
+    yield crawl_queue
+    crawl_queue.close()
+
+
+def test_expired_lease_is_taken_over(crawl_queue):
+    crawl_queue.enqueue('history', range(10), num_shards=1)
+    first = crawl_queue.lease('history', 'worker-a', batch_size=5, lease_seconds=300)
+    assert first == [0, 1, 2, 3, 4]
+    # Live leases are skipped
+    assert crawl_queue.lease('history', 'worker-b', batch_size=5) == [5, 6, 7, 8, 9]
+    assert crawl_queue.lease('history', 'worker-c', batch_size=5) == []
+
+    # A lease that ran out without progress goes to the next worker
+    crawl_queue.conn.execute("UPDATE tasks SET lease_expires = 0 WHERE owner = 'worker-a'")
+    assert crawl_queue.lease('history', 'worker-d', batch_size=5) == first
+
+    # The old owner finishing anyway stores the entry once
+    crawl_queue.complete('history', 'worker-a', 0, {'entry_id': 0})
+    crawl_queue.complete('history', 'worker-d', 0, {'entry_id': 0})
+    assert list(crawl_queue.results('history')) == [{'entry_id': 0}]
+
+
+def test_workers_steal_from_other_shards(crawl_queue):
+    entry_ids = list(range(40))
+    crawl_queue.enqueue('history', entry_ids, num_shards=4)
+    own = [entry_id for entry_id in entry_ids if shard_of(entry_id, 4) == 0]
+
+    assert crawl_queue.lease('history', 'worker-0', shards=[0], batch_size=100) == own
+    # With its own shard drained, the worker takes pending work from the others
+    stolen = crawl_queue.lease('history', 'worker-0', shards=[0], batch_size=100)
+    assert sorted(stolen) == sorted(set(entry_ids) - set(own))
+
+
+def test_failed_after_max_attempts(crawl_queue):
+    crawl_queue.enqueue('history', [1, 2], num_shards=1)
+    for attempt in range(3):
+        leased = crawl_queue.lease('history', 'worker-a', batch_size=1)
+        assert leased == [1]
+        crawl_queue.fail('history', 1, 'HTTP 500', max_attempts=3)
+        expected = 'failed' if attempt == 2 else 'pending'
+        assert crawl_queue.conn.execute("SELECT status FROM tasks WHERE entry_id = 1").fetchone()[0] == expected
+
+    assert crawl_queue.lease('history', 'worker-a', batch_size=10) == [2]
+    assert crawl_queue.status('history') == {'failed': 1, 'leased': 1}
+
+
+def test_export_waits_for_appenders(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'crawl_queue.db')
+    output_file = str(tmp_path / 'player_history.jsonl')
+    crawl_queue = CrawlQueue(db_path)
+    crawl_queue.enqueue('history', [1], num_shards=1)
+    crawl_queue.complete('history', 'worker-a', 1, {'entry_id': 1})
+    crawl_queue.close()
+
+    held = []
+    real_file_lock = storage.file_lock
+
+    @contextmanager
+    def recording_lock(path):
+        with real_file_lock(path):
+            held.append(path)
+            yield
+
+    monkeypatch.setattr(crawl, 'file_lock', recording_lock)
+    assert export_results('history', output_file=output_file, db_path=db_path) == 1
+    assert held == [output_file]
+    assert read_jsonl_records(output_file) == [{'entry_id': 1}]
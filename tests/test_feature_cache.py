@@ -0,0 +1,57 @@
+import pandas as pd
+
+from analytics import feature_cache
+from analytics.features import compute_features_chunked
+from data_io.storage import JsonlWriter
+
+
+def write_jsonl(path, records):
+    with JsonlWriter(path, 'w') as outfile:
+        outfile.write_records(records)
+
+
+def season(name, total_points, rank):
+    return {'season_name': name, 'total_points': total_points, 'rank': rank}
+
+
+def test_changed_past_seasons_are_recomputed(tmp_path, monkeypatch):
+    players_file = str(tmp_path / 'players.jsonl')
+    histories_file = str(tmp_path / 'player_history.jsonl')
+    output_file = str(tmp_path / 'player_histories_and_metrics.csv')
+    cache_file = str(tmp_path / 'feature_cache.db')
+    write_jsonl(players_file, [{'entry_id': entry_id, 'joined_time': '2024-08-01T12:00:00Z',
+                                'player_first_name': 'Ana', 'player_last_name': 'Horvat'} for entry_id in (1, 2, 3)])
+    past = {
+        1: [season('2022/23', 2100, 50000), season('2023/24', 2300, 20000)],
+        2: [season('2023/24', 1900, 900000)],
+        3: [],
+    }
+
+    computed = []
+
+    def counting_metrics(past_seasons):
+        computed.append(past_seasons)
+        return calculate_metrics(past_seasons)
+
+    calculate_metrics = feature_cache._calculate_metrics
+    monkeypatch.setattr(feature_cache, '_calculate_metrics', counting_metrics)
+
+    def run():
+        computed.clear()
+        write_jsonl(histories_file, [{'entry_id': entry_id, 'past': seasons, 'current': []} for entry_id, seasons in past.items()])
+        compute_features_chunked(players_file, histories_file, output_file, chunk_size=2, cache_file=cache_file)
+        return pd.read_csv(output_file).set_index('entry_id')
+
+    first = run()
+    assert len(computed) == 3
+
+    # Unchanged histories come from the cache
+    assert run().equals(first) and computed == []
+
+    # A new past season of one entry recomputes only that entry
+    past[2] = past[2] + [season('2024/25', 2500, 1000)]
+    second = run()
+    assert computed == [past[2]]
+    assert second.loc[2, 'number_of_past_seasons'] == 2
+    assert second.loc[2, 'maximum_total_points'] == 2500
+    assert first.loc[2, 'maximum_total_points'] != 2500
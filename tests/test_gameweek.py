@@ -0,0 +1,35 @@
+from analytics.gameweek import gameweek_tables
+from data_io.storage import JsonlWriter
+
+
+def write_jsonl(path, records):
+    with JsonlWriter(path, 'w') as outfile:
+        outfile.write_records(records)
+
+
+def test_gameweek_tables(tmp_path):
+    picks_file = str(tmp_path / 'picks_history.jsonl')
+    players_file = str(tmp_path / 'players.jsonl')
+    salah = {'element': 1, 'player_name': 'Salah'}
+    haaland = {'element': 2, 'player_name': 'Haaland'}
+    write_jsonl(picks_file, [
+        {'entry_id': 10, 'active_chip': 'bboost', 'entry_history': {'event': 3},
+         'picks': [dict(salah, is_captain=False), dict(haaland, is_captain=True)]},
+        {'entry_id': 20, 'active_chip': None, 'entry_history': {'event': 3},
+         'picks': [dict(haaland, is_captain=True)]},
+        # Another gameweek
+        {'entry_id': 10, 'active_chip': 'wildcard', 'entry_history': {'event': 4},
+         'picks': [dict(salah, is_captain=True)]},
+    ])
+    write_jsonl(players_file, [
+        {'entry_id': 10, 'player_first_name': 'Ana', 'player_last_name': 'Horvat'},
+        {'entry_id': 20, 'player_first_name': 'Ivo', 'player_last_name': 'Babic'},
+    ])
+
+    tables = gameweek_tables(3, picks_file, players_file)
+    assert tables['ownership'] == [
+        {'element': 2, 'player_name': 'Haaland', 'count': 2, 'percent': 100.0},
+        {'element': 1, 'player_name': 'Salah', 'count': 1, 'percent': 50.0},
+    ]
+    assert tables['captains'] == [{'element': 2, 'player_name': 'Haaland', 'count': 2, 'percent': 100.0}]
+    assert tables['chips'] == [{'entry_id': 10, 'player_first_name': 'Ana', 'player_last_name': 'Horvat', 'chip': 'bboost'}]
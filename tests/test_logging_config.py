@@ -0,0 +1,32 @@
+import logging
+import queue
+
+from logging_config import DeferredQueueHandler
+
+
+def make_record(msg, *args):
+    return logging.LogRecord('test', logging.INFO, __file__, 0, msg, args, None)
+
+
+def test_message_is_formatted_before_queueing():
+    handler = DeferredQueueHandler(queue.Queue())
+    picks = [1, 2]
+    handler.handle(make_record("picks: %s", picks))
+    picks.append(3)
+    assert handler.queue.get_nowait().getMessage() == "picks: [1, 2]"
+
+
+def test_dropped_records_are_reported():
+    handler = DeferredQueueHandler(queue.Queue(maxsize=2))
+    for i in range(5):
+        handler.handle(make_record("entry %s", i))
+    assert handler.dropped == 3
+    handler.queue.get_nowait()
+    handler.queue.get_nowait()
+
+    handler.handle(make_record("after"))
+    warning, after = handler.queue.get_nowait(), handler.queue.get_nowait()
+    assert warning.levelno == logging.WARNING
+    assert warning.getMessage() == "3 log records dropped, the log queue was full"
+    assert after.getMessage() == "after"
+    assert handler.unreported == 0
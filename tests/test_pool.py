@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from analytics.pool import AnalyticsPool, PoolBusyError
+
+
+def test_timed_out_job_keeps_its_slot():
+    pool = AnalyticsPool(max_workers=1, max_concurrency=1, max_pending=0, timeout=0.5)
+
+    async def scenario():
+        # Start the worker process first, so the timeout only covers the job
+        await pool.run("time:sleep", 0)
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run("time:sleep", 2)
+        # The worker is still busy with the timed-out job, so new jobs are turned away
+        assert pool.pending == 1
+        with pytest.raises(PoolBusyError):
+            await pool.run("time:sleep", 0)
+        await asyncio.sleep(2)
+        assert pool.pending == 0
+        assert await pool.run("operator:add", 1, 2) == 3
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
@@ -0,0 +1,49 @@
+from api.results import ResponseCache, file_signature, lookup, query_csv, render_page, store
+from data_io.storage import atomic_write
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        csvfile.write('entry_id,v\n')
+        csvfile.writelines(f"{entry_id},{value}\n" for entry_id, value in rows)
+
+
+def test_sort_mixed_column(tmp_path):
+    path = str(tmp_path / 'player_odds.csv')
+    write_csv(path, [(1, 5), (2, 'abc'), (3, ''), (4, 7)])
+
+    _, rows = query_csv(path, sort='v')
+    assert [row['v'] for row in rows] == [5, 7, 'abc', None]
+    # Numbers before strings and missing values last in both directions
+    _, rows = query_csv(path, sort='-v')
+    assert [row['v'] for row in rows] == [7, 5, 'abc', None]
+    total, rows = query_csv(path, sort='-v', offset=1, limit=2)
+    assert total == 4 and [row['entry_id'] for row in rows] == [1, 2]
+
+
+def test_etag_and_invalidation_on_rewrite(tmp_path):
+    path = str(tmp_path / 'player_odds.csv')
+    write_csv(path, [(1, 5), (2, 7)])
+    cache = ResponseCache(max_bytes=1 << 20)
+    key = ('odds', 'json', 0, 100)
+
+    def get(if_none_match=None):
+        signature = file_signature(path)
+        etag, response = lookup(cache, key, signature, if_none_match)
+        if response is None:
+            total, rows = query_csv(path)
+            response = store(cache, key, signature, etag, *render_page(total, 0, 100, rows, 'json'))
+        return etag, response
+
+    etag, response = get()
+    assert response.status_code == 200 and response.headers['ETag'] == etag
+    assert cache.misses == 1
+    assert get(etag)[1].status_code == 304
+    assert get()[1].body == response.body and cache.hits == 1
+
+    # A rewritten file changes the ETag and drops the cached body
+    with atomic_write(path) as csvfile:
+        csvfile.write('entry_id,v\n1,9\n')
+    new_etag, response = get(etag)
+    assert new_etag != etag and response.status_code == 200
+    assert b'9' in response.body and cache.misses == 2
@@ -0,0 +1,54 @@
+import threading
+import time
+
+import pytest
+
+from data_io.singleflight import SingleFlight, TTLCache, coalesced
+
+
+def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    calls = []
+
+    @coalesced(flight)
+    def write_league_file(league_id):
+        calls.append(league_id)
+        time.sleep(0.2)
+        if league_id == 'bad':
+            raise ValueError(league_id)
+        return {'league_id': league_id}
+
+    results, errors = [], []
+
+    def request(league_id):
+        try:
+            results.append(write_league_file(league_id))
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=request, args=(league_id,)) for league_id in ['314'] * 5 + ['bad'] * 3]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(calls) == ['314', 'bad']
+    assert results == [{'league_id': '314'}] * 5 and len(errors) == 3
+    # Nothing is kept once the call is done
+    assert write_league_file('314') == {'league_id': '314'} and len(calls) == 3
+    with pytest.raises(ValueError):
+        write_league_file('bad')
+
+
+def test_ttl_cache_expires_and_evicts():
+    cache = TTLCache(ttl=0.1, max_size=2)
+    cache.put('a', b'1')
+    cache.put('b', b'2')
+    cache.put('c', b'3')
+    assert cache.get('a') is None and cache.get('c') == b'3'
+    time.sleep(0.15)
+    assert cache.get('c') is None
+
+    disabled = TTLCache(ttl=0, max_size=2)
+    disabled.put('a', b'1')
+    assert disabled.get('a') is None
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from analytics.sketch import QuantileSketch, load_sketches, save_sketches
+
+
+def test_merged_sketch_stays_within_error(tmp_path):
+    rng = np.random.default_rng(7)
+    # Chunks with different distributions, as from different leagues or workers
+    chunks = [rng.normal(50, 10, 40000), rng.exponential(20, 30000), rng.integers(0, 100, 30000).astype(float)]
+    chunks[0][::100] = np.nan
+    merged = QuantileSketch(error=0.01)
+    for seed, chunk in enumerate(chunks):
+        merged.merge(QuantileSketch(error=0.01, seed=seed).update(chunk))
+
+    population = pd.Series(np.concatenate(chunks)).dropna()
+    sample = population.sample(2000, random_state=1)
+    # Exact percentile ranks of the sampled values within the population
+    expected = population.rank(pct=True)[sample.index].to_numpy()
+    approx = merged.percentile_rank(sample.to_numpy())
+
+    assert merged.count == len(population) and merged.na_count == 400
+    # Missing values rank at the bottom, so ranks of present values scale by the present share
+    total = merged.count + merged.na_count
+    assert np.max(np.abs(approx * total / merged.count - expected)) <= 0.01
+
+    # The stored sketches answer the same
+    save_sketches({'total_points': merged}, str(tmp_path / 'percentile_sketches.json'))
+    loaded = load_sketches(str(tmp_path / 'percentile_sketches.json'))['total_points']
+    assert np.array_equal(loaded.percentile_rank(sample.to_numpy()), approx)
@@ -0,0 +1,31 @@
+import os
+from array import array
+
+from data_io.standings import COLUMNS, StandingsStore
+
+
+def snapshot(league_id, event, ranks):
+    return [{'entry': entry, 'league_id': league_id, 'timestamp': 1700000000.0 + event, 'event': event,
+             'rank': rank, 'total': 3 * event, 'points_for': 50 * event} for entry, rank in ranks.items()]
+
+
+def test_partial_rows_are_truncated_before_append(tmp_path):
+    directory = str(tmp_path / 'standings_h2h')
+    StandingsStore(directory).append(snapshot(7, 1, {101: 1, 102: 2}))
+
+    # A crash after only some columns of the next row were appended
+    for name in ('entry', 'league', 'timestamp'):
+        with open(os.path.join(directory, name + '.bin'), 'ab') as file:
+            array(COLUMNS[name], [999]).tofile(file)
+    store = StandingsStore(directory)
+    assert len(store) == 2
+
+    store.append(snapshot(7, 2, {101: 2, 102: 1}))
+    sizes = {name: os.path.getsize(os.path.join(directory, name + '.bin')) // array(typecode).itemsize
+             for name, typecode in COLUMNS.items()}
+    assert set(sizes.values()) == {4}
+
+    assert [(point['event'], point['rank']) for point in store.trajectory(102)] == [(1, 2), (2, 1)]
+    movers = store.movers(7)
+    assert [(mover['entry'], mover['rank_change']) for mover in movers['risers']] == [(102, 1)]
+    assert [(mover['entry'], mover['rank_change']) for mover in movers['fallers']] == [(101, -1)]
@@ -0,0 +1,86 @@
+import os
+import stat
+
+from data_io.jsoncodec import dump_lines, loads
+from data_io.storage import atomic_write, find_jsonl, iter_jsonl_lines, read_jsonl_records, JsonlWriter, LockedAppender
+
+# Characters str.splitlines treats as line breaks but JSON writes unescaped
+SEPARATORS = '\u2028\u2029\u0085\x1c\x1d\x1e'
+
+
+def test_compressed_lines_keep_unicode_separators(tmp_path):
+    path = str(tmp_path / 'players.jsonl')
+    records = [{'entry_id': i, 'entry_name': f"team{SEPARATORS}{i}"} for i in range(5)]
+    with JsonlWriter(path, 'w', codec='gzip', block_size=64) as writer:
+        writer.write_records(records)
+
+    lines = list(iter_jsonl_lines(path, start=1))
+    assert [line_number for line_number, _ in lines] == [1, 2, 3, 4]
+    assert [loads(line) for _, line in lines] == records[1:]
+    assert read_jsonl_records(path) == records
+
+
+def test_atomic_write_keeps_file_mode(tmp_path):
+    existing = str(tmp_path / 'state.txt')
+    with open(existing, 'w') as file:
+        file.write('0')
+    os.chmod(existing, 0o640)
+    with atomic_write(existing) as file:
+        file.write('1')
+    assert stat.S_IMODE(os.stat(existing).st_mode) == 0o640
+
+    umask = os.umask(0)
+    os.umask(umask)
+    new = str(tmp_path / 'leagues.csv')
+    with atomic_write(new) as file:
+        file.write('id\n')
+    assert stat.S_IMODE(os.stat(new).st_mode) == 0o666 & ~umask
+
+
+def test_compressed_append_resume_and_index_repair(tmp_path):
+    path = str(tmp_path / 'classic_league.jsonl')
+    records = [{'page': i, 'results': list(range(i))} for i in range(30)]
+    for start in range(0, 30, 10):
+        with JsonlWriter(path, codec='gzip', block_size=200) as writer:
+            writer.write_records(records[start:start + 10])
+    physical, codec = find_jsonl(path)
+    assert codec == 'gzip'
+
+    # A current index is appended to, not rewritten
+    inode = os.stat(physical + '.idx').st_ino
+    with JsonlWriter(path) as writer:
+        writer.write_records(records[:1])
+    assert os.stat(physical + '.idx').st_ino == inode
+    records.append(records[0])
+
+    # A crash that cut the index short is repaired on the next append
+    with open(physical + '.idx', 'rb') as index_file:
+        index = index_file.read()
+    with open(physical + '.idx', 'wb') as index_file:
+        index_file.write(index[:-5])
+    with JsonlWriter(path) as writer:
+        writer.write_records(records[1:2])
+    records.append(records[1])
+    with open(physical + '.idx', 'rb') as index_file:
+        assert index_file.read().startswith(index)
+
+    lines = list(iter_jsonl_lines(path, start=25))
+    assert [line_number for line_number, _ in lines] == list(range(25, 32))
+    assert [loads(line) for _, line in lines] == records[25:]
+
+
+def test_locked_appender_writes_whole_blocks(tmp_path):
+    path = str(tmp_path / 'transfer_history.jsonl')
+    with JsonlWriter(path, 'w', codec='gzip'):
+        pass
+    records = [{'entry': i, 'element_in': i} for i in range(100)]
+    with LockedAppender(path, batch_bytes=1000) as appender:
+        for record in records:
+            appender.write_records([record])
+
+    physical, _ = find_jsonl(path)
+    with open(physical + '.idx') as index_file:
+        blocks = [line.split() for line in index_file]
+    # One block per ~1000 bytes of lines, not one per write
+    assert len(blocks) == -(-len(dump_lines(records)) // 1000)
+    assert read_jsonl_records(path) == records